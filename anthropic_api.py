@@ -10,11 +10,13 @@ Endpoints:
 
 import json
 import time
-import random
-import asyncio
+import secrets
+from dataclasses import dataclass, field
 from typing import AsyncIterator
+
+import orjson
 from fastapi import Request, HTTPException, Header
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from langchain_core.messages import BaseMessage
@@ -23,12 +25,6 @@ from models.anthropic_types import (
     AnthropicResponse,
     AnthropicUsage,
     AnthropicErrorResponse,
-    AnthropicStreamMessageStart,
-    AnthropicStreamContentBlockStart,
-    AnthropicStreamContentBlockDelta,
-    AnthropicStreamContentBlockStop,
-    AnthropicStreamMessageDelta,
-    AnthropicStreamMessageStop,
     AnthropicContentBlock,
 )
 from converters.anthropic_request_converter import (
@@ -37,6 +33,7 @@ from converters.anthropic_request_converter import (
     create_anthropic_error_response,
 )
 from core.logger import get_logger
+from core.stream_coalescing import coalesce_text_deltas
 
 logger = get_logger(__name__)
 
@@ -44,93 +41,69 @@ logger = get_logger(__name__)
 # Import get_chat_model here to avoid circular import
 # It will be imported when needed (lazy import)
 def _get_chat_model():
-    """Lazy import to avoid circular dependency."""
+    """Lazy import to avoid circular dependency. Not cached: get_chat_model() is a
+    dict lookup and must see the chat model of the current lifespan."""
     from api import get_chat_model
     return get_chat_model()
 
 
-# --- Helper Functions ---
-
-def validate_anthropic_request(request: AnthropicRequest) -> None:
-    """
-    Validate an Anthropic request according to Anthropic's API requirements.
+# --- Stream State ---
 
-    Required fields:
-    - model: Must be a non-empty string
-    - max_tokens: Must be > 0
-    - messages: Must be non-empty
-
-    Args:
-        request: AnthropicRequest to validate
-
-    Raises:
-        HTTPException: If validation fails
-    """
-    if not request.model or request.model.strip() == "":
-        raise HTTPException(
-            status_code=400,
-            detail=create_anthropic_error_response(
-                "invalid_request_error",
-                "model: This field is required"
-            ).dict()
-        )
+@dataclass(slots=True)
+class _ToolState:
+    """Per-tool-call state accumulated while streaming tool_use blocks."""
+    id: str | None = None
+    name: str | None = None
+    arguments_chunks: list[str] = field(default_factory=list)
+    block_index: int = 0
+    started: bool = False
 
-    if request.max_tokens is None or request.max_tokens <= 0:
-        raise HTTPException(
-            status_code=400,
-            detail=create_anthropic_error_response(
-                "invalid_request_error",
-                "max_tokens: This field is required and must be > 0"
-            ).dict()
-        )
 
-    if not request.messages or len(request.messages) == 0:
-        raise HTTPException(
-            status_code=400,
-            detail=create_anthropic_error_response(
-                "invalid_request_error",
-                "messages: Must provide at least one message"
-            ).dict()
-        )
+# --- Stream Event Generators ---
+# Events are assembled as plain dicts and serialized with orjson: building and
+# dumping a pydantic model per streamed token dominates the hot loop otherwise.
+# The dict layouts mirror the AnthropicStream* models in models.anthropic_types.
 
-    # Validate message roles
-    valid_roles = {"user", "assistant", "system"}
-    for msg in request.messages:
-        if msg.role not in valid_roles:
-            raise HTTPException(
-                status_code=400,
-                detail=create_anthropic_error_response(
-                    "invalid_request_error",
-                    f"messages: Invalid role '{msg.role}'. Must be one of: {valid_roles}"
-                ).dict()
-            )
+# Frames whose bytes never (or barely) change are pre-encoded once.
+_SSE_MESSAGE_STOP = b'event: message_stop\ndata: {"type":"message_stop"}\n\n'
+_SSE_CONTENT_BLOCK_STOP_PREFIX = b'event: content_block_stop\ndata: {"type":"content_block_stop","index":'
+_SSE_CONTENT_BLOCK_DELTA_PREFIX = b'event: content_block_delta\ndata: {"type":"content_block_delta","index":'
+_SSE_DELTA_KEY = b',"delta":'
+_SSE_SUFFIX = b'}\n\n'
 
+# Ask proxies (nginx, ALBs) not to cache or buffer the stream so each event is
+# flushed to the client as soon as it is yielded.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-# --- Stream Event Generators ---
 
-def generate_message_start(message_id: str, model: str) -> str:
+def generate_message_start(message_id: str, model: str) -> bytes:
     """Generate message_start event"""
-    event = AnthropicStreamMessageStart(
-        message=AnthropicResponse(
-            id=message_id,
-            model=model,
-            content=[],
-            usage=AnthropicUsage(input_tokens=0, output_tokens=0)
-        )
-    )
-    return f"event: message_start\ndata: {event.json(exclude_none=True)}\n\n"
-
-
-def generate_content_block_start(index: int, content_block: dict) -> str:
+    payload = {
+        "type": "message_start",
+        "message": {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "content": [],
+            "model": model,
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 0, "output_tokens": 0},
+        },
+    }
+    return b"event: message_start\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+
+def generate_content_block_start(index: int, content_block: dict) -> bytes:
     """Generate content_block_start event"""
-    event = AnthropicStreamContentBlockStart(
-        index=index,
-        content_block=content_block
-    )
-    return f"event: content_block_start\ndata: {event.json(exclude_none=True)}\n\n"
+    payload = {
+        "type": "content_block_start",
+        "index": index,
+        "content_block": content_block,
+    }
+    return b"event: content_block_start\ndata: " + orjson.dumps(payload) + b"\n\n"
 
 
-def generate_content_block_delta(index: int, delta_type: str, text: str = None, partial_json: str = None) -> str:
+def generate_content_block_delta(index: int, delta_type: str, text: str = None, partial_json: str = None) -> bytes:
     """Generate content_block_delta event"""
     delta = {"type": delta_type}
     if text is not None:
@@ -138,32 +111,30 @@ def generate_content_block_delta(index: int, delta_type: str, text: str = None,
     if partial_json is not None:
         delta["partial_json"] = partial_json
 
-    event = AnthropicStreamContentBlockDelta(
-        index=index,
-        delta=delta
-    )
-    return f"event: content_block_delta\ndata: {event.json(exclude_none=True)}\n\n"
+    # Hot path: only the delta object is serialized, the envelope is pre-encoded
+    return b"".join((
+        _SSE_CONTENT_BLOCK_DELTA_PREFIX, str(index).encode(), _SSE_DELTA_KEY, orjson.dumps(delta), _SSE_SUFFIX
+    ))
 
 
-def generate_content_block_stop(index: int) -> str:
+def generate_content_block_stop(index: int) -> bytes:
     """Generate content_block_stop event"""
-    event = AnthropicStreamContentBlockStop(index=index)
-    return f"event: content_block_stop\ndata: {event.json(exclude_none=True)}\n\n"
+    return _SSE_CONTENT_BLOCK_STOP_PREFIX + str(index).encode() + _SSE_SUFFIX
 
 
-def generate_message_delta(stop_reason: str, usage: AnthropicUsage) -> str:
+def generate_message_delta(stop_reason: str, usage: AnthropicUsage) -> bytes:
     """Generate message_delta event"""
-    event = AnthropicStreamMessageDelta(
-        delta={"stop_reason": stop_reason, "stop_sequence": None},
-        usage=usage
-    )
-    return f"event: message_delta\ndata: {event.json(exclude_none=True)}\n\n"
+    payload = {
+        "type": "message_delta",
+        "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+        "usage": {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens},
+    }
+    return b"event: message_delta\ndata: " + orjson.dumps(payload) + b"\n\n"
 
 
-def generate_message_stop() -> str:
+def generate_message_stop() -> bytes:
     """Generate message_stop event"""
-    event = AnthropicStreamMessageStop()
-    return f"event: message_stop\ndata: {event.json(exclude_none=True)}\n\n"
+    return _SSE_MESSAGE_STOP
 
 
 async def anthropic_stream_generator(
@@ -172,7 +143,7 @@ async def anthropic_stream_generator(
     tools: list,
     max_tokens: int,
     message_id: str
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """
     Generate Anthropic-compatible streaming events from LangChain stream.
 
@@ -187,61 +158,55 @@ async def anthropic_stream_generator(
         message_id: Unique message ID
 
     Yields:
-        Server-Sent Events (SSE) formatted strings
+        Server-Sent Events (SSE) formatted bytes
     """
     total_response_size = 0
 
-    def _track(data: str) -> str:
+    def _track(data: bytes) -> bytes:
         nonlocal total_response_size
         total_response_size += len(data)
         return data
 
     try:
         chat_model = _get_chat_model()
-        chat_model.model = model
 
         # Send message_start event
         yield _track(generate_message_start(message_id, model))
 
         # Start streaming from LangChain
-        content_buffer = ""
+        content_chunks: list[str] = []
+        # Next free content block index; text and tool_use blocks draw from it in
+        # the order they are opened, so indices never collide or leave gaps.
         block_index = 0
+        text_block_index = 0
         text_block_started = False
         text_block_has_content = False
 
         # Track tool_calls state
-        # Key: tool index (from OpenAI format), Value: dict with id, name, arguments_buffer, block_index, started
-        tool_states: dict[int, dict] = {}
-        stop_reason = "end_turn"
-
-        # Stream content
-        async for chunk in chat_model.astream(lc_messages, max_tokens=max_tokens, tools=tools):
-            # The chunk can be either:
-            # - ChatGenerationChunk (with .message attribute containing AIMessageChunk)
-            # - AIMessageChunk directly
-            # We need to handle both cases
-            if hasattr(chunk, "message") and chunk.message is not None:
-                message = chunk.message
-            else:
-                # chunk itself is the message (AIMessageChunk)
-                message = chunk
-
-            # Get content and additional_kwargs from the message
-            content_delta = getattr(message, "content", None)
-            additional_kwargs = getattr(message, "additional_kwargs", {})
+        # Key: tool index (from OpenAI format); insertion order follows the tool indices
+        tool_states: dict[int, _ToolState] = {}
+        tool_states_get = tool_states.get
+
+        # Stream content (text deltas arrive coalesced, see coalesce_text_deltas)
+        deltas = coalesce_text_deltas(
+            chat_model.astream(lc_messages, model=model, max_tokens=max_tokens, tools=tools)
+        )
+        async for content_delta, additional_kwargs in deltas:
             if content_delta:
                 # Start text block on first text content
                 if not text_block_started:
+                    text_block_index = block_index
+                    block_index += 1
                     yield _track(generate_content_block_start(
-                        index=block_index,
+                        index=text_block_index,
                         content_block={"type": "text", "text": ""}
                     ))
                     text_block_started = True
 
-                content_buffer += content_delta
+                content_chunks.append(content_delta)
                 text_block_has_content = True
                 yield _track(generate_content_block_delta(
-                    index=block_index,
+                    index=text_block_index,
                     delta_type="text_delta",
                     text=content_delta
                 ))
@@ -252,8 +217,7 @@ async def anthropic_stream_generator(
             if tool_calls_delta:
                 # Close text block if it was started and has content
                 if text_block_started and text_block_has_content:
-                    yield _track(generate_content_block_stop(block_index))
-                    block_index += 1
+                    yield _track(generate_content_block_stop(text_block_index))
                     text_block_started = False
                     text_block_has_content = False
 
@@ -266,69 +230,67 @@ async def anthropic_stream_generator(
                     tc_arguments = tc_function.get("arguments", "")
 
                     # Initialize tool state if this is a new tool
-                    if tc_index not in tool_states:
-                        tool_states[tc_index] = {
-                            "id": tc_id,
-                            "name": tc_name,
-                            "arguments_buffer": "",
-                            "block_index": block_index + tc_index,
-                            "started": False
-                        }
-
-                    state = tool_states[tc_index]
+                    state = tool_states_get(tc_index)
+                    if state is None:
+                        state = tool_states[tc_index] = _ToolState(
+                            id=tc_id, name=tc_name, block_index=block_index
+                        )
+                        block_index += 1
+                    block_idx = state.block_index
+                    started = state.started
 
                     # Update id and name if provided (they come in the first chunk)
-                    if tc_id and not state["id"]:
-                        state["id"] = tc_id
-                    if tc_name and not state["name"]:
-                        state["name"] = tc_name
+                    if tc_id and not state.id:
+                        state.id = tc_id
+                    if tc_name and not state.name:
+                        state.name = tc_name
 
                     # Send content_block_start for this tool if not started
-                    if not state["started"] and state["id"] and state["name"]:
+                    if not started and state.id and state.name:
                         # Convert OpenAI tool call ID to Anthropic format
-                        anthropic_id = state["id"]
+                        anthropic_id = state.id
                         if anthropic_id.startswith("call_"):
                             anthropic_id = "toolu_" + anthropic_id[5:]
 
                         yield _track(generate_content_block_start(
-                            index=state["block_index"],
+                            index=block_idx,
                             content_block={
                                 "type": "tool_use",
                                 "id": anthropic_id,
-                                "name": state["name"],
+                                "name": state.name,
                                 "input": {}
                             }
                         ))
-                        state["started"] = True
+                        state.started = started = True
 
                     # Stream argument fragments as input_json_delta
-                    if tc_arguments and state["started"]:
-                        state["arguments_buffer"] += tc_arguments
+                    if tc_arguments and started:
+                        state.arguments_chunks.append(tc_arguments)
                         yield _track(generate_content_block_delta(
-                            index=state["block_index"],
+                            index=block_idx,
                             delta_type="input_json_delta",
                             partial_json=tc_arguments
                         ))
 
-                # Set stop_reason to tool_use if we have tool calls
-                stop_reason = "tool_use"
-
         # Close text block if it was started but not closed
         if text_block_started:
-            yield _track(generate_content_block_stop(block_index))
-            block_index += 1
+            yield _track(generate_content_block_stop(text_block_index))
 
         # Close all tool blocks
-        for tc_index, state in sorted(tool_states.items()):
-            if state["started"]:
-                yield _track(generate_content_block_stop(state["block_index"]))
+        for state in tool_states.values():
+            if state.started:
+                yield _track(generate_content_block_stop(state.block_index))
+
+        # Any tool call seen during the stream makes this a tool_use turn
+        stop_reason = "tool_use" if tool_states else "end_turn"
 
         # Send message_delta with usage
         # Note: Accurate token counting requires backend support
+        content_buffer = "".join(content_chunks)
         usage = AnthropicUsage(
             input_tokens=0,  # Backend should provide this
             output_tokens=len(content_buffer.split()) + sum(
-                len(s["arguments_buffer"]) for s in tool_states.values()
+                sum(map(len, s.arguments_chunks)) for s in tool_states.values()
             ) // 4  # Rough estimate
         )
         yield _track(generate_message_delta(stop_reason, usage))
@@ -345,7 +307,7 @@ async def anthropic_stream_generator(
         logger.exception("Error in anthropic_stream_generator")
         # Send error event
         error_response = create_anthropic_error_response("api_error", str(e))
-        yield f"event: error\ndata: {error_response.json()}\n\n"
+        yield b"event: error\ndata: " + orjson.dumps(error_response.model_dump()) + b"\n\n"
 
 
 # --- API Endpoints ---
@@ -370,26 +332,23 @@ async def create_message(
         anthropic_version: API version from header
 
     Returns:
-        AnthropicResponse (non-streaming) or StreamingResponse (streaming)
+        JSON Response with an AnthropicResponse body (non-streaming) or StreamingResponse (streaming)
     """
     # Log version warning if missing
     if anthropic_version is None:
         logger.warning("[ANTHROPIC] Missing anthropic-version header")
 
-    # Validate request
-    validate_anthropic_request(request)
-
     # Get chat model
     chat_model = _get_chat_model()
 
     # Check if model is available
-    if request.model not in chat_model.available_models:
+    if request.model not in chat_model.available_models_set:
         raise HTTPException(
             status_code=404,
             detail=create_anthropic_error_response(
                 "not_found_error",
                 f"Model '{request.model}' not found. Available models: {', '.join(chat_model.available_models)}"
-            ).dict()
+            ).model_dump()
         )
 
     # Log request
@@ -409,7 +368,7 @@ async def create_message(
     tools = lc_params["tools"]
 
     # Generate message ID
-    message_id = f"msg_{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=24))}"
+    message_id = f"msg_{secrets.token_hex(12)}"
 
     # Handle streaming vs non-streaming
     if request.stream:
@@ -422,7 +381,8 @@ async def create_message(
                 max_tokens=request.max_tokens,
                 message_id=message_id
             ),
-            media_type="text/event-stream"
+            media_type="text/event-stream",
+            headers=_SSE_HEADERS,
         )
 
     else:
@@ -430,10 +390,9 @@ async def create_message(
         try:
             logger.info(f"[ANTHROPIC] Starting non-streaming invoke for message {message_id}")
 
-            # Use invoke for synchronous call
-            response = await asyncio.to_thread(
-                chat_model.invoke,
+            response = await chat_model.ainvoke(
                 lc_messages,
+                model=request.model,
                 max_tokens=request.max_tokens,
                 tools=tools
             )
@@ -447,21 +406,23 @@ async def create_message(
             )
             anthropic_resp.id = message_id
 
-            response_size = len(json.dumps(anthropic_resp.model_dump(mode='json'), ensure_ascii=False))
+            # Serialize once here and hand FastAPI a ready-made Response, which
+            # skips jsonable_encoder and the default JSONResponse re-encoding.
+            body = anthropic_resp.model_dump_json(exclude_none=True).encode("utf-8")
             logger.info(
                 f"[ANTHROPIC RESPONSE] message_id={message_id}, "
                 f"stop_reason={anthropic_resp.stop_reason}, "
                 f"content_blocks={len(anthropic_resp.content)}, "
-                f"response_size={response_size}"
+                f"response_size={len(body)}"
             )
 
-            return anthropic_resp
+            return Response(content=body, media_type="application/json")
 
         except Exception as e:
             logger.exception(f"[ANTHROPIC] Error during invoke: {e}")
             raise HTTPException(
                 status_code=500,
-                detail=create_anthropic_error_response("api_error", str(e)).dict()
+                detail=create_anthropic_error_response("api_error", str(e)).model_dump()
             )
 
 
@@ -1,38 +1,59 @@
 import os
 import json
+import time
+import secrets
 import asyncio
+import hashlib
 from contextlib import asynccontextmanager
+
+import orjson
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional, Dict, Any, Union, Literal
 
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage, ToolMessage
 from core.llm import OCAChatModel
 from core.oauth2_token_manager import OCAOauth2TokenManager
 from core.logger import get_logger
+from core.stream_coalescing import coalesce_text_deltas
 from model_resolver import resolve_model_for_endpoint
 
 # Import Anthropic API endpoints
 from anthropic_api import create_message
+from converters.anthropic_request_converter import create_anthropic_error_response
 
 logger = get_logger(__name__)
 
+# Ask proxies (nginx, ALBs) not to cache or buffer SSE streams so each chunk is
+# flushed to the client as soon as it is yielded.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Chat completion SSE framing; frames are built as bytes so Starlette writes
+# them straight to the transport without a str round-trip.
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
 # --- Pydantic Models for OpenAI Compatibility ---
 
 class ModelCard(BaseModel):
     id: str
-    object: str = "model"
-    created: int = Field(default_factory=lambda: int(__import__('time').time()))
+    object: Literal["model"] = "model"
+    created: int = Field(default_factory=lambda: int(time.time()))
     owned_by: str = "owner"
 
 class ModelList(BaseModel):
-    object: str = "list"
+    object: Literal["list"] = "list"
     data: List[ModelCard]
 
 class ChatMessage(BaseModel):
-    role: str
+    # Every role the OpenAI Chat Completions API accepts; developer/function
+    # are accepted but not forwarded (see convert_to_langchain_messages)
+    role: Literal["system", "user", "assistant", "tool", "developer", "function"]
     content: Optional[Union[str, List[Dict[str, str]]]] = None
     tool_calls: Optional[List[Dict[str, Any]]] = None  # Present on assistant deltas
     tool_call_id: Optional[str] = None                 # Present on tool role messages
@@ -52,10 +73,14 @@ class ChatCompletionChoice(BaseModel):
     message: ChatMessage
     finish_reason: Optional[str] = "stop"
 
+def _completion_id() -> str:
+    # 29 URL-safe chars drawn straight from os.urandom, no per-char Python loop
+    return "chatcmpl-" + secrets.token_urlsafe(22)[:29]
+
 class ChatCompletionResponse(BaseModel):
-    id: str = Field(default_factory=lambda: f"chatcmpl-{''.join(__import__('random').choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=29))}")
-    object: str = "chat.completion"
-    created: int = Field(default_factory=lambda: int(__import__('time').time()))
+    id: str = Field(default_factory=_completion_id)
+    object: Literal["chat.completion"] = "chat.completion"
+    created: int = Field(default_factory=lambda: int(time.time()))
     model: str
     choices: List[ChatCompletionChoice]
     usage: Optional[Dict[str, int]] = None
@@ -71,9 +96,9 @@ class ChatCompletionStreamChoice(BaseModel):
     finish_reason: Optional[str] = None
 
 class ChatCompletionStreamResponse(BaseModel):
-    id: str = Field(default_factory=lambda: f"chatcmpl-{''.join(__import__('random').choices('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=29))}")
-    object: str = "chat.completion.chunk"
-    created: int = Field(default_factory=lambda: int(__import__('time').time()))
+    id: str = Field(default_factory=_completion_id)
+    object: Literal["chat.completion.chunk"] = "chat.completion.chunk"
+    created: int = Field(default_factory=lambda: int(time.time()))
     model: str
     choices: List[ChatCompletionStreamChoice]
 
@@ -93,9 +118,7 @@ async def lifespan(app: FastAPI):
         chat_model = OCAChatModel.from_env(token_manager, debug=True)
         lifespan_objects["chat_model"] = chat_model
         logger.info("--- Core components initialized successfully ---")
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
+    except Exception:
         logger.exception("FATAL: Failed to initialize core components")
         # In this case, the application will not work properly.
         lifespan_objects["chat_model"] = None
@@ -103,12 +126,29 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("--- Cleaning up resources ---")
+    chat_model = lifespan_objects.get("chat_model")
+    if chat_model is not None:
+        await chat_model.token_manager.aclose()
     lifespan_objects.clear()
 
 # --- FastAPI App Initialization ---
 app = FastAPI(lifespan=lifespan)
+# Compress JSON bodies (model lists, non-streaming completions); Starlette's
+# GZipMiddleware leaves text/event-stream responses untouched since 0.46, which
+# pyproject.toml pins as the lower bound so SSE streams are never buffered
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
 
 # --- Validation Error Handler ---
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks: set = set()
+
+def _write_debug_file(path: str, data: bytes) -> None:
+    try:
+        with open(path, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        logger.warning(f"[VALIDATION ERROR] Could not write {path}: {e}")
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -116,22 +156,37 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     """
     body = await request.body()
     try:
-        body_json = json.loads(body)
-    except:
+        body_json = orjson.loads(body)
+    except orjson.JSONDecodeError:
         body_json = body.decode("utf-8", errors="replace")
 
-    # Save to file for debugging
-    with open("logs/validation_error_request.json", "w") as f:
-        json.dump({
-            "url": str(request.url),
-            "method": request.method,
-            "body": body_json,
-            "errors": exc.errors()
-        }, f, ensure_ascii=False, indent=2)
+    # Save to file for debugging; the write runs in a worker thread so a burst
+    # of bad requests does not block the event loop on disk I/O
+    payload = orjson.dumps({
+        "url": str(request.url),
+        "method": request.method,
+        "body": body_json,
+        "errors": exc.errors()
+    }, option=orjson.OPT_INDENT_2, default=str)
+    task = asyncio.create_task(asyncio.to_thread(_write_debug_file, "logs/validation_error_request.json", payload))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     logger.error(f"[VALIDATION ERROR] {exc.errors()}")
-    # Re-raise to return normal 422 response
-    raise exc
+    if request.url.path == "/v1/messages":
+        # Anthropic SDK clients only understand Anthropic's error envelope
+        return _anthropic_validation_error(exc)
+    # Return the normal 422 response
+    return await request_validation_exception_handler(request, exc)
+
+def _anthropic_validation_error(exc: RequestValidationError) -> Response:
+    """Map a /v1/messages validation error to Anthropic's 400 invalid_request_error."""
+    first = exc.errors()[0]
+    # Drop the leading "body" so the message names the request field, e.g. "max_tokens: ..."
+    loc = ".".join(str(part) for part in first.get("loc", ())[1:])
+    message = f"{loc}: {first['msg']}" if loc else first["msg"]
+    error = create_anthropic_error_response("invalid_request_error", message)
+    return Response(content=orjson.dumps(error.model_dump()), status_code=400, media_type="application/json")
 
 # --- Helper Functions ---
 def get_chat_model() -> OCAChatModel:
@@ -241,58 +296,86 @@ def get_chat_model() -> OCAChatModel:
 #
 #     return cleaned_messages
 
+# Roles that map straight onto a LangChain message class with content only
+_CONTENT_ONLY_ROLES = {"user": HumanMessage, "system": SystemMessage}
+
 def convert_to_langchain_messages(messages: List[ChatMessage]) -> List[BaseMessage]:
     """
     Convert API ChatMessage list to LangChain BaseMessage list, preserving
     tool_calls in assistant messages and translating tool role messages.
     """
     lc_messages: List[BaseMessage] = []
+    append = lc_messages.append
     for msg in messages:
-        # Normalize content
-        if msg.content is None:
+        # Normalize content; plain strings are by far the common case, so test
+        # for them first (exact class checks: parsed JSON yields plain str/list)
+        content = msg.content
+        content_cls = content.__class__
+        if content_cls is str:
+            content_str = content
+        elif content is None:
             content_str = ""
-        elif isinstance(msg.content, str):
-            content_str = msg.content
-        elif isinstance(msg.content, list):
-            parts = [part.get("text", "") for part in msg.content if isinstance(part, dict)]
-            content_str = "\n".join(parts)
+        elif content_cls is list:
+            # Parts are dicts per the ChatMessage schema; non-text parts are skipped
+            content_str = "\n".join([part["text"] for part in content if "text" in part])
         else:
-            content_str = str(msg.content)
+            content_str = str(content)
 
-        # Role mapping
-        if msg.role == "user":
-            lc_messages.append(HumanMessage(content=content_str))
+        # Role mapping. Fields were already validated by ChatMessage, so the
+        # plain messages are built with model_construct to skip re-validation.
+        role = msg.role
+        message_cls = _CONTENT_ONLY_ROLES.get(role)
+        if message_cls is not None:
+            append(message_cls.model_construct(content=content_str))
 
-        elif msg.role == "assistant":
+        elif role == "assistant":
             # 仅当存在 tool_calls 时才传 additional_kwargs，避免空 dict 触发验证异常
             if msg.tool_calls:
-                lc_messages.append(
-                    AIMessage(content=content_str, additional_kwargs={"tool_calls": msg.tool_calls})
-                )
+                # Keep validation here: AIMessage's validator parses the
+                # additional_kwargs tool_calls into .tool_calls, which
+                # _convert_message_to_dict relies on for the payload format
+                append(AIMessage(content=content_str, additional_kwargs={"tool_calls": msg.tool_calls}))
             else:
-                lc_messages.append(AIMessage(content=content_str))
+                append(AIMessage.model_construct(content=content_str))
 
-        elif msg.role == "tool":
+        elif role == "tool":
             # 当 tool_call_id 为空时省略该字段
             if msg.tool_call_id:
-                lc_messages.append(ToolMessage(content=content_str, tool_call_id=msg.tool_call_id))
+                append(ToolMessage.model_construct(content=content_str, tool_call_id=msg.tool_call_id))
             else:
-                lc_messages.append(ToolMessage(content=content_str))
-
-        elif msg.role == "system":
-            lc_messages.append(SystemMessage(content=content_str))
+                append(ToolMessage(content=content_str))
 
     return lc_messages
 
 # --- API Endpoints ---
-@app.get("/v1/models", response_model=ModelList)
+# The model and chat-completion endpoints build their JSON bodies directly; their
+# pydantic response models are registered via responses= for the OpenAPI schema
+# only (no runtime validation pass).
+
+# Encoded /v1/models body, rebuilt only when chat_model.available_models is
+# replaced; "created" is stamped once per rebuild
+_model_list_cache: Dict[str, Any] = {"models": None, "body": b""}
+
+def _model_list_body(available_models: List[str]) -> bytes:
+    if _model_list_cache["models"] is not available_models:
+        created = int(time.time())
+        _model_list_cache["body"] = orjson.dumps({
+            "object": "list",
+            "data": [
+                {"id": model_id, "object": "model", "created": created, "owned_by": "owner"}
+                for model_id in available_models
+            ],
+        })
+        _model_list_cache["models"] = available_models
+    return _model_list_cache["body"]
+
+@app.get("/v1/models", responses={200: {"model": ModelList}})
 async def list_models():
     """
     Provides an OpenAI-compatible endpoint for listing available models.
     """
     chat_model = get_chat_model()
-    model_cards = [ModelCard(id=model_id) for model_id in chat_model.available_models]
-    return ModelList(data=model_cards)
+    return Response(content=_model_list_body(chat_model.available_models), media_type="application/json")
 
 class LiteLLMParams(BaseModel):
     model: str
@@ -321,41 +404,68 @@ class ModelData(BaseModel):
 class ModelInfoList(BaseModel):
     data: List[ModelData]
 
-@app.get("/v1/model/info", response_model=ModelInfoList)
-async def list_models_info():
+def _model_info_entry(model_id: str) -> dict:
+    """One ModelData-shaped entry for /v1/model/info."""
+    return {
+        "model_name": model_id,
+        "litellm_params": {"model": model_id},
+        "model_info": {
+            "id": model_id,
+            "db_model": False,
+            "key": model_id,
+            # Add token limits and pricing if available
+            "max_tokens": None,
+            "max_input_tokens": None,
+            "max_output_tokens": None,
+            "input_cost_per_token": None,
+            "input_cost_per_character": None,
+            "output_cost_per_token": None,
+            "output_cost_per_character": None,
+            "litellm_provider": "oca",  # your provider name
+            "mode": "chat",  # or "completion" depending on your models
+        },
+    }
+
+# Encoded /v1/model/info body and its ETag, rebuilt only when
+# chat_model.available_models is replaced (fetch_available_models assigns a new
+# list rather than mutating)
+_model_info_cache: Dict[str, Any] = {"models": None, "body": b"", "etag": ""}
+
+def _model_info_body(available_models: List[str]) -> tuple[bytes, str]:
+    if _model_info_cache["models"] is not available_models:
+        body = orjson.dumps({"data": [_model_info_entry(model_id) for model_id in available_models]})
+        _model_info_cache["body"] = body
+        _model_info_cache["etag"] = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _model_info_cache["models"] = available_models
+    return _model_info_cache["body"], _model_info_cache["etag"]
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check with weak comparison (RFC 9110 13.1.2): the header may
+    list several tags, each possibly W/-prefixed (proxies such as nginx gzip
+    weaken ETags), or be "*".
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+@app.get("/v1/model/info", responses={200: {"model": ModelInfoList}})
+async def list_models_info(request: Request):
     """
     Provides a LiteLLM-compatible endpoint for listing available models with detailed info.
+    Supports conditional GET: a matching If-None-Match gets an empty 304.
     """
     try:
         chat_model = get_chat_model()
-
-        model_data_list = []
-        for model_id in chat_model.available_models:
-            model_data = ModelData(
-                model_name=model_id,
-                litellm_params=LiteLLMParams(
-                    model=model_id
-                ),
-                model_info=ModelInfo(
-                    id=model_id,
-                    db_model=False,
-                    key=model_id,
-                    mode="chat",  # or "completion" depending on your models
-                    litellm_provider="oca",  # your provider name
-                    # Add token limits and pricing if available:
-                    # max_tokens=4096,
-                    # max_input_tokens=8192,
-                    # max_output_tokens=4096,
-                    # input_cost_per_token=0.00003,
-                    # output_cost_per_token=0.00006,
-                )
-            )
-            model_data_list.append(model_data)
-
-        return ModelInfoList(data=model_data_list)
+        body, etag = _model_info_body(chat_model.available_models)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
-        import traceback
-        traceback.print_exc()
         logger.exception("Error in list_models_info")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -384,11 +494,56 @@ async def spend_calculate(request: Request):
         }
     }
 
-@app.post("/v1/chat/completions")
-async def create_chat_completion(request: ChatCompletionRequest):
+def _inline_schema_refs(schema: dict) -> dict:
+    """Inline a pydantic JSON schema's local $defs so it can stand alone in openapi_extra."""
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None and ref.startswith("#/$defs/"):
+                return resolve(defs[ref[len("#/$defs/"):]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+def _parse_chat_request(body: bytes) -> ChatCompletionRequest:
+    """
+    Parse and validate the raw body in one pydantic-core pass (validate_json),
+    skipping FastAPI's json.loads + validate_python round-trip. Errors are
+    re-raised as RequestValidationError so clients still get the usual 422.
+    """
+    try:
+        return ChatCompletionRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+            body=body,
+        )
+
+@app.post(
+    "/v1/chat/completions",
+    # Documents both response shapes: the JSON completion and, for stream=true,
+    # the SSE chunk payload (bodies are built directly, not through these models)
+    responses={200: {
+        "model": ChatCompletionResponse,
+        "content": {"text/event-stream": {
+            "schema": _inline_schema_refs(ChatCompletionStreamResponse.model_json_schema()),
+        }},
+    }},
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _inline_schema_refs(ChatCompletionRequest.model_json_schema())}},
+    }},
+)
+async def create_chat_completion(raw_request: Request):
     """
     Provides an OpenAI-compatible chat completion endpoint, supporting both streaming and non-streaming responses.
     """
+    request = _parse_chat_request(await raw_request.body())
     chat_model = get_chat_model()
 
     # Resolve the requested model using endpoint-aware model resolution
@@ -402,12 +557,8 @@ async def create_chat_completion(request: ChatCompletionRequest):
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    chat_model.model = resolved_model
     request.model = resolved_model
 
-    # Update the model instance with parameters from the request
-    chat_model.temperature = request.temperature
-
     # NOTE: Validation moved to unified _validate_tool_call_sequences() in core/llm.py
     # No need to pre-validate here - it will be done automatically in _stream()/_astream()
     lc_messages = convert_to_langchain_messages(request.messages)
@@ -425,39 +576,49 @@ async def create_chat_completion(request: ChatCompletionRequest):
     if request.stream:
         async def stream_generator():
             total_response_size = 0
+            # Chunks are plain dicts serialized with orjson (mirroring
+            # ChatCompletionStreamResponse); one frame template is reused and
+            # only its delta is swapped per chunk. id/created are per stream.
+            choice = {"index": 0, "delta": {}, "finish_reason": None}
+            frame = {
+                "id": _completion_id(),
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.model,
+                "choices": [choice],
+            }
             try:
-                # Use astream for asynchronous streaming
-                async for chunk in chat_model.astream(lc_messages, max_tokens=request.max_tokens, tool_choice=request.tool_choice, tools=request.tools):
+                # Use astream for asynchronous streaming; runs of small text chunks
+                # are merged so each frame carries more than a single token
+                deltas = coalesce_text_deltas(
+                    chat_model.astream(
+                        lc_messages,
+                        model=request.model,
+                        temperature=request.temperature,
+                        max_tokens=request.max_tokens,
+                        tool_choice=request.tool_choice,
+                        tools=request.tools,
+                    )
+                )
+                async for content_delta, additional_kwargs in deltas:
                     # Support both content tokens and tool_calls deltas
-                    content_delta = getattr(chunk, "content", None)
-                    tool_calls_delta = None
-                    try:
-                        tool_calls_delta = getattr(getattr(chunk, "message", None), "additional_kwargs", {}).get("tool_calls")
-                    except Exception:
-                        tool_calls_delta = None
+                    tool_calls_delta = additional_kwargs.get("tool_calls")
 
                     if content_delta or tool_calls_delta:
-                        stream_response = ChatCompletionStreamResponse(
-                            model=request.model,
-                            choices=[ChatCompletionStreamChoice(
-                                index=0,
-                                delta=DeltaMessage(content=content_delta, tool_calls=tool_calls_delta)
-                            )]
-                        )
-                        chunk_data = f"data: {stream_response.json()}\n\n"
+                        delta = {}
+                        if content_delta:
+                            delta["content"] = content_delta
+                        if tool_calls_delta:
+                            delta["tool_calls"] = tool_calls_delta
+                        choice["delta"] = delta
+                        chunk_data = _SSE_PREFIX + orjson.dumps(frame) + _SSE_SUFFIX
                         total_response_size += len(chunk_data)
                         yield chunk_data
 
                 # Send final [DONE] signal
-                final_chunk = ChatCompletionStreamResponse(
-                    model=request.model,
-                    choices=[ChatCompletionStreamChoice(
-                        index=0,
-                        delta=DeltaMessage(),
-                        finish_reason="stop"
-                    )]
-                )
-                done_data = f"data: {final_chunk.json()}\n\ndata: [DONE]\n\n"
+                choice["delta"] = {}
+                choice["finish_reason"] = "stop"
+                done_data = b"".join((_SSE_PREFIX, orjson.dumps(frame), _SSE_SUFFIX, _SSE_DONE))
                 total_response_size += len(done_data)
                 yield done_data
 
@@ -473,17 +634,18 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 error_response = {
                     "error": {"message": "An error occurred during streaming.", "type": "server_error"}
                 }
-                yield f"data: {json.dumps(error_response)}\n\n"
+                yield _SSE_PREFIX + orjson.dumps(error_response) + _SSE_SUFFIX
 
-        return StreamingResponse(stream_generator(), media_type="text/event-stream")
+        return StreamingResponse(stream_generator(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
     # --- Non-streaming response ---
     else:
         try:
-            # Use invoke for synchronous call (run within asyncio.to_thread)
-            response = await asyncio.to_thread(
-                chat_model.invoke,
+            # Native async call (OCAChatModel._agenerate); no worker thread
+            response = await chat_model.ainvoke(
                 lc_messages,
+                model=request.model,
+                temperature=request.temperature,
                 max_tokens=request.max_tokens,
                 tool_choice=request.tool_choice,
                 tools=request.tools
@@ -496,20 +658,31 @@ async def create_chat_completion(request: ChatCompletionRequest):
             except Exception:
                 tool_calls = None
 
-            completion_response = ChatCompletionResponse(
-                model=request.model,
-                choices=[ChatCompletionChoice(
-                    index=0,
-                    message=ChatMessage(role="assistant", content=response.content, tool_calls=tool_calls)
-                )]
-            )
-            response_size = len(json.dumps(completion_response.model_dump(mode='json'), ensure_ascii=False))
+            # Body mirrors ChatCompletionResponse; built as a dict and encoded
+            # once, which also gives the logged size for free
+            body = orjson.dumps({
+                "id": _completion_id(),
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.model,
+                "choices": [{
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": response.content,
+                        "tool_calls": tool_calls,
+                        "tool_call_id": None,
+                    },
+                    "finish_reason": "stop",
+                }],
+                "usage": None,
+            })
             logger.info(
                 f"[CHAT COMPLETIONS] Completed response, "
                 f"model={request.model}, "
-                f"response_size={response_size}"
+                f"response_size={len(body)}"
             )
-            return completion_response
+            return Response(content=body, media_type="application/json")
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -574,11 +747,10 @@ async def responses_create(
     Returns:
         Response (non-streaming) or StreamingResponse (streaming)
     """
-    # Get the raw request body
-    body_bytes = await request.body()
+    # Parse the raw body once with orjson (no intermediate str decode)
     try:
-        request_body = json.loads(body_bytes)
-    except json.JSONDecodeError:
+        request_body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
         raise HTTPException(
             status_code=400,
             detail={
@@ -644,6 +816,11 @@ async def responses_delete(response_id: str):
 
 if __name__ == "__main__":
     # For direct execution and testing, use uvicorn:
-    # Command line: uvicorn app:app --reload --port 8000
+    # Command line: uvicorn api:app --reload --port 8000
+    # Keep a single worker: stored responses (GET /v1/responses/{id}) live in
+    # process memory and token refreshes rewrite .env. uvloop and httptools are
+    # not dependencies, and uvicorn fails at startup if the explicit flags name a
+    # missing package, so they are only shown as an optional extra.
     print("To run this application, use the command:")
-    print("uvicorn api:app --host 0.0.0.0 --port 8000")
+    print("uvicorn api:app --host 0.0.0.0 --port 8000 --backlog 2048")
+    print("Optional, after `pip install uvloop httptools`: add --loop uvloop --http httptools")
@@ -1,23 +1,41 @@
 import os
+import time
 import streamlit as st
-from dotenv import load_dotenv
-import yaml
-import re
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from core.llm import OCAChatModel
 from core.oauth2_token_manager import OCAOauth2TokenManager
 from ui import conversation_manager as cm
 from ui import utils as ui_utils
 
 # --- Load configuration ---
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+@st.cache_resource(show_spinner=False)
+def load_config():
+    """Parses config.yaml once per server process instead of on every rerun (read-only)."""
+    import yaml
+
+    with open('config.yaml', 'r') as f:
+        return yaml.safe_load(f)
+
+@st.cache_resource(show_spinner=False)
+def load_environment() -> None:
+    """Loads .env into os.environ once per server process."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+config = load_config()
+
+# Minimum seconds between live re-renders of a streaming reply (~20 Hz); each
+# render re-sends the whole markdown string to the browser
+STREAM_RENDER_INTERVAL = 0.05
+# Number of most recent chat messages rendered on every rerun
+HISTORY_TAIL_SIZE = 20
 
 # --- 1. App Configuration ---
 st.set_page_config(page_title="OCA Chat", page_icon="🤖", layout="wide")
 st.title("🤖 OCA Large Model Chatbot")
-load_dotenv()
+load_environment()
 
 # --- 2. Initialize Core Components & Session State ---
 if "token_manager" not in st.session_state:
@@ -45,32 +63,44 @@ if "edit_index" not in st.session_state:
 if "edit_content" not in st.session_state:
     st.session_state.edit_content = ""
 
+def delete_selected_chat() -> None:
+    """on_click callback: deletes the conversation chosen in the sidebar selectbox."""
+    key = st.session_state.get("delete_target")
+    if key is not None:
+        cm.delete_chat(key)
+
 # --- 3. Sidebar ---
 with st.sidebar:
     st.header("💬 Conversation Management")
-    if st.button("➕ New Chat", use_container_width=True):
-        cm.new_chat()
-        st.rerun()
+    # State changes run as on_click callbacks: Streamlit reruns once after the
+    # callback, instead of once for the click and again for an explicit st.rerun()
+    st.button("➕ New Chat", use_container_width=True, on_click=cm.new_chat)
 
     st.subheader("History")
     if not st.session_state.get("conversations"):
         st.caption("No previous conversations")
     else:
-        sorted_keys = sorted(
-            st.session_state.conversations.keys(),
-            key=lambda k: (k != st.session_state.get("current_key"))
-        )
+        # Current conversation first, the rest in insertion order (single O(n) pass)
+        current_key = st.session_state.get("current_key")
+        sorted_keys = [k for k in st.session_state.conversations if k == current_key]
+        sorted_keys += [k for k in st.session_state.conversations if k != current_key]
         for key in sorted_keys:
             conv_data = st.session_state.conversations[key]
             title = conv_data.get("title", f"Chat-{key[:4]}")
-            button_type = "primary" if key == st.session_state.get("current_key") else "secondary"
-            col1, col2 = st.columns([0.8, 0.2])
-            with col1:
-                if st.button(f"📜 {title}", key=f"load_{key}", use_container_width=True, type=button_type):
-                    cm.load_chat(key)
-                    st.rerun()
-            with col2:
-                st.button("🗑️", key=f"del_{key}", use_container_width=True, on_click=cm.delete_chat, args=(key,))
+            button_type = "primary" if key == current_key else "secondary"
+            st.button(
+                f"📜 {title}", key=f"load_{key}", use_container_width=True, type=button_type,
+                on_click=cm.load_chat, args=(key,),
+            )
+        # Deletion is one selectbox plus one button (not a delete button per
+        # conversation), so the sidebar builds N + 2 widgets per rerun
+        with st.expander("🗑️ Manage conversations"):
+            conversations = st.session_state.conversations
+            st.selectbox(
+                "Conversation", sorted_keys, key="delete_target",
+                format_func=lambda k: conversations[k].get("title", f"Chat-{k[:4]}"),
+            )
+            st.button("Delete", use_container_width=True, on_click=delete_selected_chat)
 
     st.divider()
     st.header("⚙️ Settings")
@@ -113,50 +143,120 @@ st.session_state.chat_model.model = selected_model
 st.session_state.chat_model.temperature = custom_temperature
 
 # --- 5. Display Chat History with New Features ---
-for i, message in enumerate(st.session_state.get("chat_history", [])):
+@st.cache_data(max_entries=512, show_spinner=False)
+def render_ai_message(content: str, key_prefix: str) -> str:
+    """Memoized add_copy_to_code_blocks: history messages are re-drawn on every rerun but never change."""
+    return ui_utils.add_copy_to_code_blocks(content, key_prefix)
+
+def open_editor(index: int, content: str) -> None:
+    """on_click callback: opens the editor for the human message at history index."""
+    st.session_state.edit_index = index
+    st.session_state.edit_content = content
+    st.session_state.show_editor = True
+
+def close_editor() -> None:
+    """on_click callback: hides the message editor."""
+    st.session_state.show_editor = False
+
+def render_history_message(i: int, message) -> None:
+    """Draws one chat history message (with copy/edit buttons) at history index i."""
     role = "AI" if isinstance(message, AIMessage) else "Human"
     with st.chat_message(role):
         # Add copy buttons for AI messages
         if isinstance(message, AIMessage):
             # Use the new function to inject copy buttons into code blocks
-            rendered_content = ui_utils.add_copy_to_code_blocks(message.content, f"msg_{i}")
+            rendered_content = render_ai_message(message.content, f"msg_{i}")
             st.markdown(rendered_content, unsafe_allow_html=True)
             # Add a copy button for the whole response
             ui_utils.render_copy_button(message.content, f"whole_resp_{i}")
         else: # Human message
             st.markdown(message.content)
             # Add "Modify" button for human messages
-            if st.button("✏️ Edit", key=f"edit_{i}", help="Edit and resend this message"):
-                st.session_state.edit_index = i
-                st.session_state.edit_content = message.content
-                st.session_state.show_editor = True
-                st.rerun()
+            st.button(
+                "✏️ Edit", key=f"edit_{i}", help="Edit and resend this message",
+                on_click=open_editor, args=(i, message.content),
+            )
+
+# Only the last HISTORY_TAIL_SIZE messages are drawn on every rerun; older ones
+# are skipped entirely (not just collapsed) unless the user asks for them
+chat_history = st.session_state.get("chat_history", [])
+tail_start = max(0, len(chat_history) - HISTORY_TAIL_SIZE)
+if tail_start and st.toggle(
+    f"Show {tail_start} earlier messages", key=f"show_earlier_{st.session_state.get('current_key')}"
+):
+    for i in range(tail_start):
+        render_history_message(i, chat_history[i])
+for i in range(tail_start, len(chat_history)):
+    render_history_message(i, chat_history[i])
 
 # --- 6. Centralized Chat Submission Logic ---
+def render_markdown_stream(stream) -> str:
+    """
+    Renders streamed chunks as markdown and returns the full text.
+
+    Completed blocks (up to the last blank line outside a code fence) are frozen
+    in their own element as markdown and never re-rendered. The trailing block
+    is shown as plain text while streaming (no markdown parse per update, at
+    most once per STREAM_RENDER_INTERVAL) and rendered as markdown at the end.
+    """
+    container = st.container()
+    live = container.empty()
+    parts = []
+    stable_end = 0
+    # Start "overdue" so the first token renders immediately
+    last_flush = float("-inf")
+
+    def flush(text: str, final: bool) -> None:
+        nonlocal live, stable_end
+        cut = ui_utils.stable_markdown_boundary(text, stable_end)
+        if cut > stable_end:
+            # Freeze the completed blocks in the current element, continue in a new one
+            live.markdown(text[stable_end:cut])
+            live = container.empty()
+            stable_end = cut
+        if final:
+            live.markdown(text[stable_end:])
+        else:
+            live.text(text[stable_end:] + "▌")
+
+    for chunk in stream:
+        parts.append(chunk.content)
+        now = time.monotonic()
+        if now - last_flush >= STREAM_RENDER_INTERVAL:
+            flush("".join(parts), final=False)
+            last_flush = now
+    full_text = "".join(parts)
+    flush(full_text, final=True)
+    return full_text
+
 def handle_chat_submission():
     """Handles both new user input and resubmissions after editing."""
-    # Archive the state before getting the AI response
-    cm.archive_current_chat()
-
+    # Bind session state once; SessionStateProxy lookups are not plain attribute reads
+    ss = st.session_state
+    history = ss.chat_history
     with st.chat_message("AI"):
-        response_placeholder = st.empty()
-        full_response = ""
-        system_prompt = st.session_state.get("custom_system_prompt", "")
-        messages_for_api = ([AIMessage(content=system_prompt)] if system_prompt else []) + st.session_state.chat_history
+        system_prompt = ss.get("custom_system_prompt", "")
+        if system_prompt:
+            # Reuse the system message until the prompt text changes
+            system_msg = ss.get("system_msg")
+            if system_msg is None or system_msg.content != system_prompt:
+                system_msg = ss.system_msg = SystemMessage(content=system_prompt)
+            messages_for_api = [system_msg, *history]
+        else:
+            messages_for_api = history
 
         try:
-            stream = st.session_state.chat_model.stream(messages_for_api)
-            for chunk in stream:
-                full_response += chunk.content
-                response_placeholder.markdown(full_response + "▌")
-            response_placeholder.markdown(full_response)
-
-            st.session_state.chat_history.append(AIMessage(content=full_response))
-            cm.archive_current_chat()
-            st.rerun()
+            stream = ss.chat_model.stream(messages_for_api)
+            full_response = render_markdown_stream(stream)
+
+            history.append(AIMessage(content=full_response))
         except Exception as e:
             st.error(f"Error calling API: {e}")
-            st.rerun()
+    # Archive once, after the reply: archiving a new chat generates its title with
+    # a blocking LLM call, which must not delay the first streamed token. On error
+    # the user's message is still archived, as before.
+    cm.archive_current_chat()
+    st.rerun()
 
 # --- 7. User Input and Editor UI ---
 # The editor UI for modifying a message
@@ -169,19 +269,18 @@ if st.session_state.show_editor:
     with col1:
         if st.button("🔁 Resend", use_container_width=True, type="primary"):
             idx = st.session_state.edit_index
+            history = st.session_state.chat_history
+            # Truncate the history after this message in place (no copy of the kept prefix)
+            del history[idx + 1:]
             # Update the message content
-            st.session_state.chat_history[idx] = HumanMessage(content=new_content)
-            # Truncate the history after this message
-            st.session_state.chat_history = st.session_state.chat_history[:idx + 1]
+            history[idx] = HumanMessage(content=new_content)
 
             # Hide the editor and trigger a resubmission
             st.session_state.show_editor = False
             handle_chat_submission() # Re-use the submission logic
 
     with col2:
-        if st.button("❌ Cancel", use_container_width=True):
-            st.session_state.show_editor = False
-            st.rerun()
+        st.button("❌ Cancel", use_container_width=True, on_click=close_editor)
 
 # Standard chat input box, disabled if the editor is active
 if user_query := st.chat_input("Please enter your question...", disabled=st.session_state.show_editor):
@@ -5,9 +5,10 @@ This module provides conversion functions between Anthropic's Messages API forma
 and LangChain's message format, enabling seamless integration with the OCAChatModel.
 """
 
-import json
-import uuid
+import secrets
 from typing import List, Dict, Any, Optional, Union
+
+import orjson
 from langchain_core.messages import (
     HumanMessage,
     AIMessage,
@@ -141,6 +142,118 @@ from models.anthropic_types import (
 #     return cleaned_messages
 
 
+# msg.content is pydantic-validated, so it is always an exact str or list:
+# the type() identity checks in these converters are safe and cheaper than isinstance()
+def _user_to_langchain(msg: AnthropicMessage, lc_messages: List[BaseMessage]) -> None:
+    """Append the LangChain messages for an Anthropic user message."""
+    # Handle content: can be string or list of content blocks
+    if type(msg.content) is str:
+        lc_messages.append(HumanMessage(content=msg.content))
+    elif type(msg.content) is list:
+        # Single pass: text/image blocks are joined into one HumanMessage,
+        # tool_result blocks become ToolMessages (OpenAI format) after it
+        text_parts = []
+        tool_messages = []
+        for block in msg.content:
+            if block.type == "tool_result":
+                tool_content = block.content
+
+                # Extract content string from tool_result
+                if isinstance(tool_content, str):
+                    content_str = tool_content
+                elif isinstance(tool_content, list):
+                    # Extract text from tool result content blocks (a list, not a
+                    # generator: str.join materializes its input anyway)
+                    content_str = "\n".join([
+                        sub_block if isinstance(sub_block, str) else sub_block.get("text", "")
+                        for sub_block in tool_content
+                        if isinstance(sub_block, str)
+                        or (isinstance(sub_block, dict) and sub_block.get("type") == "text")
+                    ])
+                else:
+                    content_str = str(tool_content) if tool_content else ""
+
+                # Create ToolMessage for OpenAI compatibility
+                tool_messages.append(ToolMessage(
+                    content=content_str,
+                    tool_call_id=block.tool_use_id or ""
+                ))
+            elif block.type == "text":
+                text_parts.append(block.text or "")
+            elif block.type == "image":
+                # Future: handle image blocks
+                text_parts.append("[Image]")
+
+        if text_parts:
+            lc_messages.append(HumanMessage(content="\n".join(text_parts)))
+        lc_messages.extend(tool_messages)
+    else:
+        lc_messages.append(HumanMessage(content=str(msg.content)))
+
+
+def _assistant_to_langchain(msg: AnthropicMessage, lc_messages: List[BaseMessage]) -> None:
+    """Append the AIMessage for an Anthropic assistant message."""
+    # Handle content: can be string or list of content blocks
+    if type(msg.content) is str:
+        content_str = msg.content
+        tool_calls = None
+    elif type(msg.content) is list:
+        # Single pass over the blocks: collect text and convert
+        # tool_use blocks to OpenAI format
+        text_parts = []
+        tool_calls = []
+        for block in msg.content:
+            if block.type == "text":
+                text_parts.append(block.text or "")
+            elif block.type == "tool_use":
+                tool_calls.append({
+                    "type": "function",
+                    "id": block.id or f"toolu_{secrets.token_hex(12)}",
+                    "function": {
+                        "name": block.name,
+                        "arguments": orjson.dumps(block.input).decode() if isinstance(block.input, dict) else "{}"
+                    }
+                })
+        content_str = "\n".join(text_parts)
+        tool_calls = tool_calls or None
+    else:
+        content_str = str(msg.content)
+        tool_calls = None
+
+    # Create AIMessage with tool_calls if present. That one keeps validation:
+    # AIMessage's validator parses the additional_kwargs tool_calls into
+    # .tool_calls (and copies the dict anyway), which _convert_message_to_dict
+    # relies on. A plain text reply is built without re-validation.
+    if tool_calls:
+        lc_messages.append(
+            AIMessage(content=content_str, additional_kwargs={"tool_calls": tool_calls})
+        )
+    else:
+        lc_messages.append(AIMessage.model_construct(content=content_str))
+
+
+def _system_to_langchain(msg: AnthropicMessage, lc_messages: List[BaseMessage]) -> None:
+    """Append the SystemMessage for an Anthropic system message."""
+    # Handle system messages (if supported in future)
+    if type(msg.content) is str:
+        content_str = msg.content
+    else:
+        content_str = str(msg.content)
+    lc_messages.append(SystemMessage(content=content_str))
+
+
+# Role -> converter; one dict lookup per message instead of an if/elif chain
+_ROLE_CONVERTERS = {
+    "user": _user_to_langchain,
+    "assistant": _assistant_to_langchain,
+    "system": _system_to_langchain,
+}
+
+# Message class per role for plain string content. Content is already a
+# validated str, so these are built with model_construct (no re-validation).
+_STRING_CONTENT_ROLES = {"user": HumanMessage, "assistant": AIMessage, "system": SystemMessage}
+
+
 def anthropic_to_langchain_messages(
     anthropic_messages: List[AnthropicMessage]
 ) -> List[BaseMessage]:
@@ -160,105 +273,22 @@ def anthropic_to_langchain_messages(
         → LangChain:
         HumanMessage(content="Hello")
     """
+    # Fast path: most conversations carry only string content, which maps 1:1
+    # onto LangChain messages without any block handling
+    if all(type(msg.content) is str for msg in anthropic_messages):
+        string_roles = _STRING_CONTENT_ROLES
+        return [
+            string_roles[msg.role].model_construct(content=msg.content)
+            for msg in anthropic_messages
+        ]
+
     lc_messages: List[BaseMessage] = []
 
+    converters = _ROLE_CONVERTERS
     for msg in anthropic_messages:
-        if msg.role == "user":
-            # Handle content: can be string or list of content blocks
-            if isinstance(msg.content, str):
-                lc_messages.append(HumanMessage(content=msg.content))
-            elif isinstance(msg.content, list):
-                # Separate tool_result blocks from other content blocks
-                tool_result_blocks = [b for b in msg.content if b.type == "tool_result"]
-                other_blocks = [b for b in msg.content if b.type != "tool_result"]
-
-                # Process other content blocks (text, image) as HumanMessage
-                if other_blocks:
-                    text_parts = []
-                    for block in other_blocks:
-                        if block.type == "text":
-                            text_parts.append(block.text or "")
-                        elif block.type == "image":
-                            # Future: handle image blocks
-                            text_parts.append("[Image]")
-                    if text_parts:
-                        lc_messages.append(HumanMessage(content="\n".join(text_parts)))
-
-                # Process tool_result blocks as ToolMessage (OpenAI format)
-                for block in tool_result_blocks:
-                    tool_use_id = block.tool_use_id or ""
-                    tool_content = block.content
-
-                    # Extract content string from tool_result
-                    if isinstance(tool_content, str):
-                        content_str = tool_content
-                    elif isinstance(tool_content, list):
-                        # Extract text from tool result content blocks
-                        content_parts = []
-                        for sub_block in tool_content:
-                            if isinstance(sub_block, dict) and sub_block.get("type") == "text":
-                                content_parts.append(sub_block.get("text", ""))
-                            elif isinstance(sub_block, str):
-                                content_parts.append(sub_block)
-                        content_str = "\n".join(content_parts)
-                    else:
-                        content_str = str(tool_content) if tool_content else ""
-
-                    # Create ToolMessage for OpenAI compatibility
-                    lc_messages.append(ToolMessage(
-                        content=content_str,
-                        tool_call_id=tool_use_id
-                    ))
-            else:
-                lc_messages.append(HumanMessage(content=str(msg.content)))
-
-        elif msg.role == "assistant":
-            # Handle content: can be string or list of content blocks
-            if isinstance(msg.content, str):
-                content_str = msg.content
-                tool_calls = None
-            elif isinstance(msg.content, list):
-                # Check for tool_use blocks
-                tool_use_blocks = [b for b in msg.content if b.type == "tool_use"]
-                text_blocks = [b for b in msg.content if b.type == "text"]
-
-                # Extract text content
-                content_str = "\n".join([b.text or "" for b in text_blocks])
-
-                # Convert tool_use blocks to OpenAI format
-                if tool_use_blocks:
-                    tool_calls = []
-                    for block in tool_use_blocks:
-                        tool_call = {
-                            "type": "function",
-                            "id": block.id or f"toolu_{uuid.uuid4().hex[:24]}",
-                            "function": {
-                                "name": block.name,
-                                "arguments": json.dumps(block.input) if isinstance(block.input, dict) else "{}"
-                            }
-                        }
-                        tool_calls.append(tool_call)
-                else:
-                    tool_calls = None
-            else:
-                content_str = str(msg.content)
-                tool_calls = None
-
-            # Create AIMessage with tool_calls if present
-            if tool_calls:
-                lc_messages.append(
-                    AIMessage(content=content_str, additional_kwargs={"tool_calls": tool_calls})
-                )
-            else:
-                lc_messages.append(AIMessage(content=content_str))
-
-        elif msg.role == "system":
-            # Handle system messages (if supported in future)
-            if isinstance(msg.content, str):
-                content_str = msg.content
-            else:
-                content_str = str(msg.content)
-            lc_messages.append(SystemMessage(content=content_str))
+        convert = converters.get(msg.role)
+        if convert is not None:
+            convert(msg, lc_messages)
 
     return lc_messages
 
@@ -296,9 +326,11 @@ def anthropic_tools_to_openai_tools(
     if not anthropic_tools:
         return None
 
-    openai_tools = []
-    for tool in anthropic_tools:
-        openai_tool = {
+    # Not memoized: every request parses fresh tool objects, so a cache would
+    # have to key on the serialized schemas, which costs more than these
+    # wrapper dicts (input_schema itself is shared, not copied)
+    return [
+        {
             "type": "function",
             "function": {
                 "name": tool.name,
@@ -306,9 +338,8 @@ def anthropic_tools_to_openai_tools(
                 "parameters": tool.input_schema
             }
         }
-        openai_tools.append(openai_tool)
-
-    return openai_tools
+        for tool in anthropic_tools
+    ]
 
 
 def anthropic_to_langchain(request: AnthropicRequest) -> Dict[str, Any]:
@@ -393,34 +424,59 @@ def langchain_to_anthropic_response(
             ]
         }
     """
+    # The response models are built with model_construct (no validation): every
+    # field comes from this function, with its types checked here. Non-str
+    # message content (content-block lists) still goes through validation.
     content_blocks: List[AnthropicContentBlock] = []
 
     # Add text content if present
     if lc_message.content:
-        content_blocks.append(
-            AnthropicContentBlock(type="text", text=lc_message.content)
-        )
-
+        if isinstance(lc_message.content, str):
+            content_blocks.append(
+                AnthropicContentBlock.model_construct(type="text", text=lc_message.content)
+            )
+        else:
+            content_blocks.append(
+                AnthropicContentBlock(type="text", text=lc_message.content)
+            )
+
+    # AIMessage's validator has already parsed the tool calls into .tool_calls
+    # (args as a dict), so use those and skip re-parsing the argument JSON.
+    # If any call failed to parse (invalid_tool_calls), fall back to the raw
+    # OpenAI-format additional_kwargs so no call is dropped or reordered.
+    tool_calls = lc_message.tool_calls
+    if tool_calls and not lc_message.invalid_tool_calls:
+        for tool_call in tool_calls:
+            args = tool_call["args"]
+            content_blocks.append(
+                AnthropicContentBlock.model_construct(
+                    type="tool_use",
+                    id=tool_call["id"] or f"toolu_{secrets.token_hex(12)}",
+                    name=tool_call["name"] or "",
+                    input=args if isinstance(args, dict) else {}
+                )
+            )
     # Convert tool_calls from OpenAI format to Anthropic format
-    tool_calls = lc_message.additional_kwargs.get("tool_calls")
-    if tool_calls:
+    elif tool_calls := lc_message.additional_kwargs.get("tool_calls"):
         for tool_call in tool_calls:
             if isinstance(tool_call, dict):
                 function = tool_call.get("function", {})
-                tool_use_id = tool_call.get("id", f"toolu_{uuid.uuid4().hex[:24]}")
+                tool_use_id = tool_call.get("id") or f"toolu_{secrets.token_hex(12)}"
 
                 # Parse arguments JSON
                 arguments_str = function.get("arguments", "{}")
                 try:
-                    arguments = json.loads(arguments_str)
-                except json.JSONDecodeError:
+                    arguments = orjson.loads(arguments_str)
+                except orjson.JSONDecodeError:
+                    arguments = {}
+                if not isinstance(arguments, dict):
                     arguments = {}
 
                 content_blocks.append(
-                    AnthropicContentBlock(
+                    AnthropicContentBlock.model_construct(
                         type="tool_use",
                         id=tool_use_id,
-                        name=function.get("name", ""),
+                        name=function.get("name") or "",
                         input=arguments
                     )
                 )
@@ -431,13 +487,13 @@ def langchain_to_anthropic_response(
         stop_reason = "tool_use"
 
     # Create usage
-    usage = AnthropicUsage(
+    usage = AnthropicUsage.model_construct(
         input_tokens=input_tokens,
         output_tokens=output_tokens
     )
 
     # Create response
-    response = AnthropicResponse(
+    response = AnthropicResponse.model_construct(
         content=content_blocks,
         model=model,
         stop_reason=stop_reason,
@@ -475,7 +531,9 @@ def create_anthropic_error_response(
             }
         }
     """
-    return AnthropicErrorResponse(
+    # model_construct: both fields are plain strings supplied by our own error
+    # paths, so validation adds nothing (and a copied template would cost more)
+    return AnthropicErrorResponse.model_construct(
         error={
             "type": error_type,
             "message": message
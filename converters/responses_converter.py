@@ -7,8 +7,10 @@ and LangChain's message format, enabling seamless integration with the OCAChatMo
 
 import json
 import logging
-import uuid
+import secrets
 from typing import List, Dict, Any, Optional, Union
+
+import orjson
 from langchain_core.messages import (
     HumanMessage,
     AIMessage,
@@ -140,7 +142,7 @@ def response_input_to_langchain_messages(
 
             elif item_type == "function_call":
                 # Function call from assistant
-                call_id = item.get("call_id") or item.get("id") or f"call_{uuid.uuid4().hex[:24]}"
+                call_id = item.get("call_id") or item.get("id") or f"call_{secrets.token_hex(12)}"
                 name = item.get("name", "")
                 arguments = item.get("arguments", "{}")
 
@@ -250,7 +252,7 @@ def response_input_to_langchain_messages(
                         lc_messages.append(SystemMessage(content=combined_text))
 
             elif item_type == "function_call":
-                call_id = getattr(item, "call_id", None) or getattr(item, "id", None) or f"call_{uuid.uuid4().hex[:24]}"
+                call_id = getattr(item, "call_id", None) or getattr(item, "id", None) or f"call_{secrets.token_hex(12)}"
                 name = getattr(item, "name", "")
                 arguments = getattr(item, "arguments", "{}")
 
@@ -507,7 +509,7 @@ def langchain_to_response_output(
         for tool_call in tool_calls:
             if isinstance(tool_call, dict):
                 function = tool_call.get("function", {})
-                call_id = tool_call.get("id", f"call_{uuid.uuid4().hex[:24]}")
+                call_id = tool_call["id"] if "id" in tool_call else f"call_{secrets.token_hex(12)}"
                 name = function.get("name", "")
                 arguments = function.get("arguments", "{}")
 
@@ -621,7 +623,7 @@ def create_response_created_event(
 
 def _generate_event_id() -> str:
     """Generate a unique event ID."""
-    return f"event_{uuid.uuid4().hex[:24]}"
+    return f"event_{secrets.token_hex(12)}"
 
 
 def create_output_item_added_event(
@@ -641,7 +643,7 @@ def create_output_item_added_event(
         item["content"] = []
         item["status"] = "in_progress"
     elif item_type == "function_call":
-        item["call_id"] = f"call_{uuid.uuid4().hex[:24]}"
+        item["call_id"] = f"call_{secrets.token_hex(12)}"
         item["name"] = ""
         item["arguments"] = ""
         item["status"] = "in_progress"
@@ -752,6 +754,6 @@ def create_response_completed_event(
     }
 
 
-def format_stream_event(event: Dict[str, Any]) -> str:
-    """Format a stream event as SSE data."""
-    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+def format_stream_event(event: Dict[str, Any]) -> bytes:
+    """Format a stream event as SSE data (bytes, ready for StreamingResponse)."""
+    return b"".join((b"event: ", event["type"].encode(), b"\ndata: ", orjson.dumps(event), b"\n\n"))
@@ -2,6 +2,7 @@ from __future__ import annotations
 import os
 import json
 import time
+from collections import deque
 import requests
 import httpx
 from httpx import AsyncHTTPTransport, Proxy
@@ -95,6 +96,63 @@ def _build_response_log_summary(content: str, tool_calls: Optional[List[dict]])
     }
 
 
+def _accumulate_tool_call_deltas(tool_calls: Any, tool_builders: dict, order: List[Any]) -> None:
+    """Merge streamed OpenAI tool_call deltas into per-call builders, keyed by index, then id."""
+    if not isinstance(tool_calls, list):
+        return
+    for tc in tool_calls:
+        # OpenAI streaming provides an index; fall back to id or 0
+        idx = tc.get("index")
+        tid = tc.get("id")
+        if idx is not None:
+            key = ("i", idx)
+        elif tid is not None:
+            key = ("id", tid)
+        else:
+            key = ("i", 0)
+        if key not in tool_builders:
+            tool_builders[key] = {"type": "function", "id": tid, "function": {"name": None, "arguments": ""}}
+            order.append(key)
+        b = tool_builders[key]
+        # Merge fields
+        if "type" in tc and tc["type"]:
+            b["type"] = tc["type"]
+        if tid and not b.get("id"):
+            b["id"] = tid
+        fdelta = tc.get("function") or {}
+        if "name" in fdelta and fdelta["name"]:
+            b["function"]["name"] = fdelta["name"]
+        if "arguments" in fdelta and fdelta["arguments"]:
+            # Append incremental argument chunks
+            b["function"]["arguments"] += fdelta["arguments"]
+
+
+def _finalize_tool_calls(tool_builders: dict, order: List[Any]) -> Optional[List[dict]]:
+    """Build the final OpenAI-compatible tool_calls list, or None when no tool was called."""
+    if not order:
+        return None
+    final_tool_calls = []
+    for key in order:
+        b = tool_builders[key]
+        # Ensure required structure
+        if "function" not in b or b["function"] is None:
+            b["function"] = {"name": None, "arguments": ""}
+        if "arguments" not in b["function"] or b["function"]["arguments"] is None:
+            b["function"]["arguments"] = ""
+        # Coerce to str to satisfy OpenAI schema
+        if not isinstance(b["function"]["arguments"], str):
+            b["function"]["arguments"] = str(b["function"]["arguments"])
+        final_tool_calls.append(b)
+    return final_tool_calls
+
+
+def _build_chat_result(content: str, tool_calls: Optional[List[dict]]) -> ChatResult:
+    """Wrap aggregated content (and tool_calls, if any) in a single-generation ChatResult."""
+    if tool_calls is not None:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content, additional_kwargs={"tool_calls": tool_calls}))])
+    return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
 def _log_llm_request_detail(headers: dict, payload: dict) -> None:
     compact_payload = _compact_for_log(payload)
     logger.info(
@@ -170,10 +228,12 @@ def _validate_tool_call_sequences(messages: List[BaseMessage]) -> List[BaseMessa
         List of validated BaseMessage objects with complete tool call sequences
     """
     valid_messages: List[BaseMessage] = []
-    remaining_messages = messages.copy()
+    # deque: messages are consumed from the front, and delayed interruptions are
+    # pushed back onto it, both O(1) (list.pop(0) made the pass O(n^2))
+    remaining_messages = deque(messages)
 
     while remaining_messages:
-        msg = remaining_messages.pop(0)
+        msg = remaining_messages.popleft()
         weight = _calculate_message_weight(msg)
 
         # Weight 0: Clean message, add directly
@@ -216,7 +276,7 @@ def _validate_tool_call_sequences(messages: List[BaseMessage]) -> List[BaseMessa
 
             if next_weight == -1:
                 # Tool message - pop and process
-                remaining_messages.pop(0)
+                remaining_messages.popleft()
                 tool_call_id = getattr(next_msg, "tool_call_id", None)
                 if tool_call_id in remaining_ids:
                     # Matching tool result
@@ -229,7 +289,7 @@ def _validate_tool_call_sequences(messages: List[BaseMessage]) -> List[BaseMessa
                 # Interrupting message (weight >= 0)
                 # Add it to temp_2 and STOP collecting for this sequence
                 temp_2.append(next_msg)
-                remaining_messages.pop(0)  # Remove from remaining
+                remaining_messages.popleft()  # Remove from remaining
                 break  # Exit the collection loop
 
         # Sequence validation result
@@ -277,15 +337,17 @@ def _validate_tool_call_sequences(messages: List[BaseMessage]) -> List[BaseMessa
 
         # Delay interrupting messages by putting them back at the front
         if temp_2:
-            remaining_messages = temp_2 + remaining_messages
+            remaining_messages.extendleft(reversed(temp_2))
 
     return valid_messages
 
 
+_MESSAGE_ROLES = {AIMessage: "assistant", HumanMessage: "user", ToolMessage: "tool"}
+
+
 def _convert_message_to_dict(message: BaseMessage) -> dict:
     """Convert a LangChain BaseMessage object to the dictionary format needed by the API."""
-    role_map = {AIMessage: "assistant", HumanMessage: "user", ToolMessage: "tool"}
-    role = role_map.get(type(message), "system")
+    role = _MESSAGE_ROLES.get(type(message), "system")
     d: dict = {"role": role, "content": getattr(message, "content", "")}
 
     # Prefer new LangChain attributes when present
@@ -374,6 +436,8 @@ class OCAChatModel(BaseChatModel):
     token_manager: OCAOauth2TokenManager
     available_models: List[str] = Field(default_factory=list)
     model_api_support: Dict[str, List[str]] = Field(default_factory=dict)
+    _available_models_src: Optional[List[str]] = None
+    _available_models_set: frozenset = frozenset()
 
     def __init__(self, **data: Any):
         """
@@ -517,14 +581,26 @@ class OCAChatModel(BaseChatModel):
     @property
     def _llm_type(self) -> str: return "oca_chat_model"
 
+    @property
+    def available_models_set(self) -> frozenset:
+        """available_models as a frozenset, rebuilt only when the list is replaced."""
+        models = self.available_models
+        if self._available_models_src is not models:
+            self._available_models_src = models
+            self._available_models_set = frozenset(models)
+        return self._available_models_set
+
     def _build_headers(self) -> dict:
         return build_upstream_headers(self.token_manager, accept="application/json")
 
     def _build_payload(self, messages: List[BaseMessage], stream: bool, **kwargs: Any) -> dict:
+        # Per-call model/temperature overrides let shared server-side instances
+        # serve concurrent requests without mutating self.model/self.temperature.
+        temperature = kwargs.get("temperature")
         payload = {
-            "model": self.model,
+            "model": kwargs.get("model") or self.model,
             "messages": [_convert_message_to_dict(m) for m in messages],
-            "temperature": self.temperature,
+            "temperature": self.temperature if temperature is None else temperature,
             "stream": stream,
         }
         # Optional args passthrough
@@ -590,7 +666,8 @@ class OCAChatModel(BaseChatModel):
                         else:
                             tool_calls_delta = list(tool_calls_delta) + [fc_tool]
                     additional_kwargs = {}
-                    if tool_calls_delta is not None:
+                    # An empty tool_calls list is a keepalive-style no-op delta
+                    if tool_calls_delta:
                         additional_kwargs["tool_calls"] = tool_calls_delta
                     if content_delta or additional_kwargs:
                         yield ChatGenerationChunk(message=AIMessageChunk(content=content_delta or "", additional_kwargs=additional_kwargs))
@@ -612,7 +689,7 @@ class OCAChatModel(BaseChatModel):
                 json.dump(payload, f, ensure_ascii=False, indent=2)
         except Exception:
             pass
-        full_async_content = ""
+        content_parts: List[str] = []
         response_headers: dict = {}
         tool_builders_async: dict = {}
         order_async: List[Any] = []
@@ -648,54 +725,22 @@ class OCAChatModel(BaseChatModel):
                             else:
                                 tool_calls_delta = list(tool_calls_delta) + [fc_tool]
                         additional_kwargs = {}
-                        if tool_calls_delta is not None:
+                        # An empty tool_calls list is a keepalive-style no-op delta
+                        if tool_calls_delta:
                             additional_kwargs["tool_calls"] = tool_calls_delta
                         # Accumulate tool_calls into builders for final logging
                         try:
-                            tcs = tool_calls_delta
-                            if isinstance(tcs, list):
-                                for tc in tcs:
-                                    idx = tc.get("index")
-                                    tid = tc.get("id")
-                                    if idx is not None:
-                                        key = ("i", idx)
-                                    elif tid is not None:
-                                        key = ("id", tid)
-                                    else:
-                                        key = ("i", 0)
-                                    if key not in tool_builders_async:
-                                        tool_builders_async[key] = {"type": "function", "id": tid, "function": {"name": None, "arguments": ""}}
-                                        order_async.append(key)
-                                    b = tool_builders_async[key]
-                                    if "type" in tc and tc["type"]:
-                                        b["type"] = tc["type"]
-                                    if tid and not b.get("id"):
-                                        b["id"] = tid
-                                    fdelta = tc.get("function") or {}
-                                    if "name" in fdelta and fdelta["name"]:
-                                        b["function"]["name"] = fdelta["name"]
-                                    if "arguments" in fdelta and fdelta["arguments"]:
-                                        b["function"]["arguments"] += fdelta["arguments"]
+                            _accumulate_tool_call_deltas(tool_calls_delta, tool_builders_async, order_async)
                         except Exception:
                             pass
                         if content_delta or additional_kwargs:
                             if content_delta:
-                                full_async_content += content_delta
+                                content_parts.append(content_delta)
                             yield ChatGenerationChunk(message=AIMessageChunk(content=content_delta or "", additional_kwargs=additional_kwargs))
                     except json.JSONDecodeError: continue
             # After streaming completes, build final tool_calls and log final response
-            final_tool_calls_async = None
-            if order_async:
-                final_tool_calls_async = []
-                for key in order_async:
-                    b = tool_builders_async[key]
-                    if "function" not in b or b["function"] is None:
-                        b["function"] = {"name": None, "arguments": ""}
-                    if "arguments" not in b["function"] or b["function"]["arguments"] is None:
-                        b["function"]["arguments"] = ""
-                    if not isinstance(b["function"]["arguments"], str):
-                        b["function"]["arguments"] = str(b["function"]["arguments"])
-                    final_tool_calls_async.append(b)
+            final_tool_calls_async = _finalize_tool_calls(tool_builders_async, order_async)
+            full_async_content = "".join(content_parts)
             try:
                 summary_obj = _build_response_log_summary(full_async_content, final_tool_calls_async)
                 logger.info("[LLM RESPONSE] %s", json.dumps(summary_obj, ensure_ascii=False))
@@ -722,60 +767,21 @@ class OCAChatModel(BaseChatModel):
 
     def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
         # Aggregate content and reconstruct streaming tool_calls deltas into a final OpenAI-compatible list
-        full_response_content = ""
+        content_parts: List[str] = []
         tool_builders: dict = {}
         order: List[Any] = []
         for chunk in self._stream(messages, stop, run_manager, **kwargs):
             # Accumulate text content
             if getattr(chunk.message, "content", None):
-                full_response_content += chunk.message.content
+                content_parts.append(chunk.message.content)
             # Accumulate tool_calls deltas
             try:
                 additional = getattr(chunk.message, "additional_kwargs", {}) or {}
-                tcs = additional.get("tool_calls")
-                if isinstance(tcs, list):
-                    for tc in tcs:
-                        # OpenAI streaming provides an index; fall back to id or 0
-                        idx = tc.get("index")
-                        tid = tc.get("id")
-                        if idx is not None:
-                            key = ("i", idx)
-                        elif tid is not None:
-                            key = ("id", tid)
-                        else:
-                            key = ("i", 0)
-                        if key not in tool_builders:
-                            tool_builders[key] = {"type": "function", "id": tid, "function": {"name": None, "arguments": ""}}
-                            order.append(key)
-                        b = tool_builders[key]
-                        # Merge fields
-                        if "type" in tc and tc["type"]:
-                            b["type"] = tc["type"]
-                        if tid and not b.get("id"):
-                            b["id"] = tid
-                        fdelta = tc.get("function") or {}
-                        if "name" in fdelta and fdelta["name"]:
-                            b["function"]["name"] = fdelta["name"]
-                        if "arguments" in fdelta and fdelta["arguments"]:
-                            # Append incremental argument chunks
-                            b["function"]["arguments"] += fdelta["arguments"]
+                _accumulate_tool_call_deltas(additional.get("tool_calls"), tool_builders, order)
             except Exception:
                 pass
-        # Build final tool_calls list if any
-        final_tool_calls = None
-        if order:
-            final_tool_calls = []
-            for key in order:
-                b = tool_builders[key]
-                # Ensure required structure
-                if "function" not in b or b["function"] is None:
-                    b["function"] = {"name": None, "arguments": ""}
-                if "arguments" not in b["function"] or b["function"]["arguments"] is None:
-                    b["function"]["arguments"] = ""
-                # Coerce to str to satisfy OpenAI schema
-                if not isinstance(b["function"]["arguments"], str):
-                    b["function"]["arguments"] = str(b["function"]["arguments"])
-                final_tool_calls.append(b)
+        final_tool_calls = _finalize_tool_calls(tool_builders, order)
+        full_response_content = "".join(content_parts)
         # Log final response
         try:
             headers_to_log = getattr(self, "_last_response_headers", None)
@@ -798,9 +804,23 @@ class OCAChatModel(BaseChatModel):
                 )
         except Exception:
             pass
-        if final_tool_calls is not None:
-            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=full_response_content, additional_kwargs={"tool_calls": final_tool_calls}))])
-        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=full_response_content))])
+        return _build_chat_result(full_response_content, final_tool_calls)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        # Native async aggregation over _astream so ainvoke does not fall back to
+        # running the blocking _generate in a worker thread. _astream already
+        # logs the final response.
+        content_parts: List[str] = []
+        tool_builders: dict = {}
+        order: List[Any] = []
+        async for chunk in self._astream(messages, stop, run_manager, **kwargs):
+            if chunk.message.content:
+                content_parts.append(chunk.message.content)
+            try:
+                _accumulate_tool_call_deltas(chunk.message.additional_kwargs.get("tool_calls"), tool_builders, order)
+            except Exception:
+                pass
+        return _build_chat_result("".join(content_parts), _finalize_tool_calls(tool_builders, order))
 
     @property
     def _identifying_params(self) -> Mapping[str, Any]:
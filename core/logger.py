@@ -1,6 +1,7 @@
 import os
+import queue
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +16,30 @@ class _ConsoleFilter(logging.Filter):
         return getattr(record, "console", True)
 
 
+class _FileQueueHandler(QueueHandler):
+    """
+    Hand records to a background QueueListener that owns the file handler, so
+    request handlers on the event loop never block on log file writes.
+    """
+
+    def __init__(self, file_handler: logging.Handler):
+        super().__init__(queue.Queue())
+        self.listener = QueueListener(self.queue, file_handler, respect_handler_level=True)
+        self.listener.start()
+
+    def flush(self) -> None:
+        # Block until the listener has written everything queued so far
+        self.queue.join()
+
+    def close(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        super().close()
+
+
 def _ensure_parent_dir(path: str) -> None:
     directory = os.path.dirname(os.path.abspath(path))
     if directory and not os.path.exists(directory):
@@ -26,6 +51,7 @@ def get_logger(name: str) -> logging.Logger:
     Get a configured logger with:
     - File logging to LOG_FILE_PATH (from .env / environment)
     - Timed rotation every 5 days, archived files suffixed with timestamp
+    - File writes happen on a background thread (QueueHandler/QueueListener)
     - Level controlled by LOG_LEVEL (DEBUG/INFO)
     - Formatter with timestamp
     - DEBUG: also log to stdout
@@ -62,7 +88,7 @@ def get_logger(name: str) -> logging.Logger:
     file_handler.suffix = "%Y%m%d_%H%M%S"
     file_handler.setFormatter(fmt)
     file_handler.setLevel(level)
-    logger.addHandler(file_handler)
+    logger.addHandler(_FileQueueHandler(file_handler))
 
     if level == logging.DEBUG:
         sh = logging.StreamHandler()
@@ -1,4 +1,6 @@
 import os
+import ssl
+import asyncio
 import ipaddress
 import requests
 import httpx
@@ -97,6 +99,11 @@ async def _aiter_crlf_lines(response: httpx.Response) -> AsyncIterator[str]:
     if buffer:
         yield buffer.decode("utf-8", errors="replace")
 
+# Connection pool limits for the shared async LLM clients. Streams hold their
+# connection for the whole response, so allow far more than httpx's default 100.
+_ASYNC_POOL_LIMITS = httpx.Limits(max_connections=500, max_keepalive_connections=100)
+
+
 class OCAOauth2TokenManager:
     """
     Manage OAuth2 tokens, including automatic refresh and persistence.
@@ -166,6 +173,10 @@ class OCAOauth2TokenManager:
         # Track the proxy URL for which reachability was last verified, to avoid
         # re-checking on every request when FORCE_PROXY=true is steady.
         self._last_verified_proxy_url: Optional[str] = None
+        # Pooled httpx.AsyncClients keyed by (proxy, verify, trust_env); bound to
+        # the event loop they were created on (see _get_async_client)
+        self._async_clients: Dict[tuple, httpx.AsyncClient] = {}
+        self._async_clients_loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Network timeout: try to get from env, otherwise defaults to 2 seconds
         self.timeout: float = 2.0
@@ -357,6 +368,39 @@ class OCAOauth2TokenManager:
                     print(f"Retry with {secondary_mode.value} mode failed: {e2}")
                 raise ConnectionError(f"Unable to connect to {url}. Both {primary_mode.value} and {secondary_mode.value} modes failed.") from e2
 
+    def _get_async_client(self, proxy: Optional[str], verify: Any, trust_env: bool) -> httpx.AsyncClient:
+        """
+        Return a pooled AsyncClient for the given connection settings, so
+        keep-alive connections and TLS sessions are reused across requests.
+        Clients are dropped when the running event loop changes, since httpx
+        connections cannot be shared between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_clients_loop is not loop:
+            self._async_clients = {}
+            self._async_clients_loop = loop
+        key = (proxy, verify, trust_env)
+        client = self._async_clients.get(key)
+        if client is None:
+            if isinstance(verify, str):
+                # CA bundle path: load it once into an SSLContext for this pool
+                verify = ssl.create_default_context(cafile=verify)
+            # Limits must be set on the transport: AsyncClient ignores its own
+            # limits argument when an explicit transport is given
+            transport = httpx.AsyncHTTPTransport(
+                proxy=proxy, verify=verify, trust_env=trust_env, limits=_ASYNC_POOL_LIMITS
+            )
+            client = httpx.AsyncClient(transport=transport, verify=verify, trust_env=trust_env)
+            self._async_clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the pooled async clients (call on application shutdown)."""
+        clients = list(self._async_clients.values())
+        self._async_clients = {}
+        for client in clients:
+            await client.aclose()
+
     async def async_stream_request(self, method: str, url: str, _do_retry: bool = True, request_timeout: Optional[float] = None, on_open: Optional[Callable[[httpx.Response], None]] = None, **kwargs: Any) -> AsyncIterator[str]:
         """
         Perform an asynchronous streaming request.
@@ -387,41 +431,32 @@ class OCAOauth2TokenManager:
 
             # 直接让 httpx 处理 HTTPS CONNECT；无需手动重写 URL
 
-            # 构造 httpx 传输层；避免 verify/proxy 重复并禁用环境代理变量
-            # 使用 AsyncHTTPTransport 明确设置 proxy，避免某些版本不支持 AsyncClient.proxies
-            transport = None
-            if primary_proxy_config:
-                transport = httpx.AsyncHTTPTransport(
-                    proxy=primary_proxy_config,
-                    verify=(False if primary_proxy_config else ca_bundle),
-                    trust_env=False,
-                )
-
-            async with httpx.AsyncClient(
-                transport=transport,
+            # 复用按 (proxy, verify) 缓存的连接池客户端；禁用环境代理变量
+            client = self._get_async_client(
+                primary_proxy_config,
                 verify=(False if primary_proxy_config else ca_bundle),
                 trust_env=False,
-            ) as client:
-                async with client.stream(method, url, timeout=request_timeout if request_timeout is not None else self.timeout, **kwargs) as response:
-                    if response.status_code >= 400:
-                        # Read error body before raising
-                        error_body = ""
-                        try:
-                            async for chunk in response.aiter_bytes():
-                                error_body += chunk.decode("utf-8", errors="replace")
-                            print(f"[ASYNC STREAM ERROR] Status {response.status_code}, URL: {url}, Body: {error_body}")
-                        except Exception as e:
-                            print(f"[ASYNC STREAM ERROR] Status {response.status_code}, URL: {url}, Failed to read body: {e}")
-                    response.raise_for_status()
-                    if on_open is not None:
-                        try:
-                            on_open(response)
-                        except Exception:
-                            pass
-                    if self._debug:
-                        print(f"Async streaming connection to {url} with mode {primary_mode.value} succeeded.")
-                    async for line in _aiter_crlf_lines(response):
-                        yield line
+            )
+            async with client.stream(method, url, timeout=request_timeout if request_timeout is not None else self.timeout, **kwargs) as response:
+                if response.status_code >= 400:
+                    # Read error body before raising
+                    error_body = ""
+                    try:
+                        async for chunk in response.aiter_bytes():
+                            error_body += chunk.decode("utf-8", errors="replace")
+                        print(f"[ASYNC STREAM ERROR] Status {response.status_code}, URL: {url}, Body: {error_body}")
+                    except Exception as e:
+                        print(f"[ASYNC STREAM ERROR] Status {response.status_code}, URL: {url}, Failed to read body: {e}")
+                response.raise_for_status()
+                if on_open is not None:
+                    try:
+                        on_open(response)
+                    except Exception:
+                        pass
+                if self._debug:
+                    print(f"Async streaming connection to {url} with mode {primary_mode.value} succeeded.")
+                async for line in _aiter_crlf_lines(response):
+                    yield line
             return
         except httpx.RequestError as e:
             if self._debug:
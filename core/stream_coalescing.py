@@ -0,0 +1,98 @@
+"""
+Coalescing of LangChain token streams for SSE endpoints.
+
+Provides coalesce_text_deltas(), which merges runs of small text chunks from
+chat_model.astream() so each SSE endpoint emits fewer, larger frames.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+from langchain_core.outputs import ChatGenerationChunk
+
+
+def _message_fields(chunk) -> tuple:
+    """(content, additional_kwargs) of an AIMessageChunk yielded by astream."""
+    return chunk.content, chunk.additional_kwargs
+
+
+def _generation_fields(chunk: ChatGenerationChunk) -> tuple:
+    """(content, additional_kwargs) of the message wrapped in a ChatGenerationChunk."""
+    message = chunk.message
+    return message.content, message.additional_kwargs
+
+
+# Text deltas are held back until this many characters have accumulated or this
+# long has passed since the last flush, so 1-token chunks don't each become a
+# separate SSE frame. Tool-call deltas are never batched.
+_TEXT_FLUSH_CHARS = 64
+_TEXT_FLUSH_INTERVAL = 0.01
+_NO_KWARGS: dict = {}
+
+
+async def coalesce_text_deltas(chunks) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Yield (content, additional_kwargs) from a LangChain stream, merging runs of text-only chunks.
+
+    Pending text is flushed once it reaches _TEXT_FLUSH_CHARS, once
+    _TEXT_FLUSH_INTERVAL has elapsed since the last flush, or when the upstream
+    stays idle for that long. A chunk carrying tool_calls is yielded with any
+    pending text prepended to its own content.
+    """
+    loop = asyncio.get_running_loop()
+    stream = aiter(chunks)
+    # The chunks are either ChatGenerationChunk (wrapping an AIMessageChunk)
+    # or AIMessageChunk directly; the shape is fixed for a given stream, so
+    # pick the field extractor once from the first chunk.
+    extract = None
+    pending: list[str] = []
+    pending_len = 0
+    last_flush = loop.time()
+    next_chunk = None
+    try:
+        while True:
+            if pending:
+                # Only race the upstream against the flush timer while text is held back
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(anext(stream))
+                done, _ = await asyncio.wait((next_chunk,), timeout=_TEXT_FLUSH_INTERVAL)
+                if not done:
+                    yield "".join(pending), _NO_KWARGS
+                    pending.clear()
+                    pending_len = 0
+                    last_flush = loop.time()
+                    continue
+            awaitable = next_chunk if next_chunk is not None else anext(stream)
+            next_chunk = None
+            try:
+                chunk = await awaitable
+            except StopAsyncIteration:
+                break
+
+            if extract is None:
+                extract = _generation_fields if isinstance(chunk, ChatGenerationChunk) else _message_fields
+            content, additional_kwargs = extract(chunk)
+
+            if additional_kwargs.get("tool_calls"):
+                if pending:
+                    if content:
+                        pending.append(content)
+                    content = "".join(pending)
+                    pending.clear()
+                    pending_len = 0
+                    last_flush = loop.time()
+                yield content, additional_kwargs
+            elif content:
+                pending.append(content)
+                pending_len += len(content)
+                if pending_len >= _TEXT_FLUSH_CHARS or loop.time() - last_flush >= _TEXT_FLUSH_INTERVAL:
+                    yield "".join(pending), _NO_KWARGS
+                    pending.clear()
+                    pending_len = 0
+                    last_flush = loop.time()
+
+        if pending:
+            yield "".join(pending), _NO_KWARGS
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
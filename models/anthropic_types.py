@@ -5,8 +5,10 @@ This module defines Pydantic models for Anthropic's Messages API,
 compatible with the official Anthropic API specification.
 """
 
+import secrets
+
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Literal
 
 
 class AnthropicContentBlock(BaseModel):
@@ -33,10 +35,10 @@ class AnthropicMessage(BaseModel):
     """
     Represents a message in Anthropic's format.
 
-    Messages have a role (user or assistant) and content,
+    Messages have a role (user, assistant or system) and content,
     which can be a string or a list of content blocks.
     """
-    role: str  # "user" | "assistant"
+    role: Literal["user", "assistant", "system"]
     content: Union[str, List[AnthropicContentBlock]]
 
 
@@ -55,10 +57,10 @@ class AnthropicRequest(BaseModel):
     """
     Represents a request to Anthropic's /v1/messages endpoint.
 
-    Required fields:
-    - model: The model identifier
-    - max_tokens: Maximum tokens to generate
-    - messages: List of conversation messages
+    Required fields (enforced at parse time; violations surface as a 400 invalid_request_error):
+    - model: The model identifier (non-blank)
+    - max_tokens: Maximum tokens to generate (> 0)
+    - messages: List of conversation messages (at least one)
 
     Optional fields:
     - temperature: Sampling temperature (0-1)
@@ -66,9 +68,9 @@ class AnthropicRequest(BaseModel):
     - stream: Whether to use streaming response
     - top_k, top_p: Additional sampling parameters
     """
-    model: str
-    max_tokens: int
-    messages: List[AnthropicMessage]
+    model: str = Field(min_length=1, pattern=r"\S")
+    max_tokens: int = Field(gt=0)
+    messages: List[AnthropicMessage] = Field(min_length=1)
     temperature: Optional[float] = None
     tools: Optional[List[AnthropicToolDefinition]] = None
     stream: Optional[bool] = False
@@ -98,7 +100,7 @@ class AnthropicResponse(BaseModel):
     - stop_reason: Why the generation stopped
     - usage: Token usage statistics
     """
-    id: str = Field(default_factory=lambda: f"msg_{''.join(__import__('random').choices('abcdefghijklmnopqrstuvwxyz0123456789', k=24))}")
+    id: str = Field(default_factory=lambda: f"msg_{secrets.token_hex(12)}")
     type: str = "message"
     role: str = "assistant"
     content: List[AnthropicContentBlock]
@@ -11,20 +11,19 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any, Union, Literal
 from enum import Enum
 import time
-import random
-import string
+import secrets
 
 
 # --- ID Generation Helpers ---
 
 def generate_response_id() -> str:
     """Generate a unique response ID like resp_xxx"""
-    return f"resp_{''.join(random.choices(string.ascii_lowercase + string.digits, k=24))}"
+    return f"resp_{secrets.token_hex(12)}"
 
 
 def generate_item_id(prefix: str = "msg") -> str:
     """Generate a unique item ID with given prefix (msg, fc, rs, etc.)"""
-    return f"{prefix}_{''.join(random.choices(string.ascii_lowercase + string.digits, k=24))}"
+    return f"{prefix}_{secrets.token_hex(12)}"
 
 
 # --- Input Item Types ---
@@ -13,7 +13,6 @@ Reference: https://platform.openai.com/docs/api-reference/responses
 """
 
 import json
-import asyncio
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, Header
 from fastapi.responses import StreamingResponse
@@ -46,9 +45,14 @@ from converters.responses_converter import (
     format_stream_event,
 )
 from core.logger import get_logger
+from core.stream_coalescing import coalesce_text_deltas
 
 logger = get_logger(__name__)
 
+# Ask proxies (nginx, ALBs) not to cache or buffer SSE streams so each event is
+# flushed to the client as soon as it is yielded.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 # --- In-Memory Response Storage ---
 # For production, this should be replaced with a persistent store (Redis, DB, etc.)
@@ -142,11 +146,10 @@ async def response_stream_generator(
         previous_response_id: Optional previous response ID
 
     Yields:
-        Server-Sent Events (SSE) formatted strings
+        Server-Sent Events (SSE) frames as bytes
     """
     try:
         chat_model = _get_chat_model()
-        chat_model.model = model
 
         # Debug log the incoming request details
         # Log messages in detail
@@ -215,16 +218,11 @@ async def response_stream_generator(
         )
         yield _emit(added_event)
 
-        # Stream content
-        async for chunk in chat_model.astream(lc_messages, max_tokens=max_tokens, tools=tools):
-            # Handle different chunk formats
-            if hasattr(chunk, "message") and chunk.message is not None:
-                message = chunk.message
-            else:
-                message = chunk
-
-            content_delta = getattr(message, "content", None)
-            additional_kwargs = getattr(message, "additional_kwargs", {})
+        # Stream content; runs of small text chunks are merged so each
+        # output_text.delta event carries more than a single token
+        async for content_delta, additional_kwargs in coalesce_text_deltas(
+            chat_model.astream(lc_messages, model=model, max_tokens=max_tokens, tools=tools)
+        ):
             tool_calls_delta = additional_kwargs.get("tool_calls")
 
             # Handle text content
@@ -419,7 +417,6 @@ async def response_stream_generator(
     except Exception as e:
         logger.exception("Error in response_stream_generator")
         # Log more details about the error
-        import traceback
         error_details = {
             "error_type": type(e).__name__,
             "error_message": str(e),
@@ -531,7 +528,8 @@ async def create_response(
                 response_id=response_id,
                 previous_response_id=request.previous_response_id
             ),
-            media_type="text/event-stream"
+            media_type="text/event-stream",
+            headers=_SSE_HEADERS,
         )
 
     else:
@@ -539,10 +537,10 @@ async def create_response(
         try:
             logger.info(f"[RESPONSE API] Starting non-streaming invoke for {response_id}")
 
-            # Use invoke for synchronous call
-            response = await asyncio.to_thread(
-                chat_model.invoke,
+            # Native async call (OCAChatModel._agenerate); no worker thread
+            response = await chat_model.ainvoke(
                 lc_messages,
+                model=request.model,
                 max_tokens=request.max_output_tokens,
                 tools=tools,
                 tool_choice=lc_params.get("tool_choice")
@@ -0,0 +1,272 @@
+"""
+Integration Tests for the Anthropic Messages API endpoint
+
+Exercises /v1/messages with a mocked chat model, covering both the
+non-streaming JSON body and the streaming SSE event sequence.
+"""
+
+import json
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+import anthropic_api
+import api
+from anthropic_api import create_message
+from models.anthropic_types import AnthropicRequest
+
+
+@pytest.fixture
+def client():
+    """Create a test client with the Anthropic route registered."""
+    app = FastAPI()
+
+    @app.post("/v1/messages")
+    async def anthropic_create_message(request: AnthropicRequest):
+        return await create_message(request)
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def app_client():
+    """Create a test client for the real app (its exception handlers), without the lifespan."""
+    return TestClient(api.app)
+
+
+@pytest.fixture
+def mock_chat_model():
+    """Create a mock chat model that answers with text and one tool call."""
+    mock = MagicMock()
+    mock.available_models = ["oca/gpt-4.1"]
+    mock.available_models_set = frozenset(mock.available_models)
+    mock.model = "oca/gpt-4.1"
+
+    tool_call = {
+        "type": "function",
+        "id": "call_abc",
+        "function": {"name": "get_weather", "arguments": '{"city": "Tokyo"}'},
+    }
+    mock.invoke = MagicMock(
+        return_value=AIMessage(content="Checking", additional_kwargs={"tool_calls": [tool_call]})
+    )
+
+    async def mock_ainvoke(*args, **kwargs):
+        return mock.invoke(*args, **kwargs)
+
+    mock.ainvoke = mock_ainvoke
+
+    mock.astream_kwargs = []
+
+    async def mock_astream(*args, **kwargs):
+        mock.astream_kwargs.append(kwargs)
+        for text in ["Check", "ing"]:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        deltas = [
+            {"index": 0, "id": "call_abc", "type": "function",
+             "function": {"name": "get_weather", "arguments": ""}},
+            {"index": 0, "function": {"arguments": '{"city": '}},
+            {"index": 0, "function": {"arguments": '"Tokyo"}'}},
+        ]
+        for delta in deltas:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content="", additional_kwargs={"tool_calls": [delta]})
+            )
+
+    mock.astream = mock_astream
+    return mock
+
+
+def _payload(**overrides):
+    payload = {
+        "model": "oca/gpt-4.1",
+        "max_tokens": 100,
+        "messages": [{"role": "user", "content": "Weather in Tokyo?"}],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in text.strip().split("\n\n"):
+        event_line, data_line = frame.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+@patch("anthropic_api._get_chat_model")
+def test_non_streaming_returns_anthropic_message(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/messages", json=_payload())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["type"] == "message"
+    assert data["id"].startswith("msg_")
+    assert data["stop_reason"] == "tool_use"
+    assert data["content"][0] == {"type": "text", "text": "Checking"}
+    assert data["content"][1] == {
+        "type": "tool_use",
+        "id": "call_abc",
+        "name": "get_weather",
+        "input": {"city": "Tokyo"},
+    }
+    assert mock_chat_model.invoke.call_args.kwargs["model"] == "oca/gpt-4.1"
+
+
+@patch("anthropic_api._get_chat_model")
+def test_streaming_emits_text_then_tool_use_blocks(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/messages", json=_payload(stream=True))
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.headers["x-accel-buffering"] == "no"
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "message_start"
+    assert names[-2:] == ["message_delta", "message_stop"]
+
+    text = "".join(
+        data["delta"]["text"] for name, data in events
+        if name == "content_block_delta" and data["delta"]["type"] == "text_delta"
+    )
+    assert text == "Checking"
+
+    starts = [data for name, data in events if name == "content_block_start"]
+    assert starts[0]["content_block"]["type"] == "text"
+    assert starts[1]["content_block"] == {
+        "type": "tool_use", "id": "toolu_abc", "name": "get_weather", "input": {},
+    }
+
+    arguments = "".join(
+        data["delta"]["partial_json"] for name, data in events
+        if name == "content_block_delta" and data["delta"]["type"] == "input_json_delta"
+    )
+    assert json.loads(arguments) == {"city": "Tokyo"}
+
+    stops = [data["index"] for name, data in events if name == "content_block_stop"]
+    assert stops == [starts[0]["index"], starts[1]["index"]]
+    assert events[-2][1]["delta"]["stop_reason"] == "tool_use"
+    assert mock_chat_model.astream_kwargs[0]["model"] == "oca/gpt-4.1"
+
+
+@patch("anthropic_api._get_chat_model")
+def test_unknown_model_is_rejected(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/messages", json=_payload(model="oca/unknown"))
+
+    assert response.status_code == 404
+
+
+@patch("anthropic_api._get_chat_model")
+def test_invalid_role_is_rejected(mock_get_model, app_client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = app_client.post(
+        "/v1/messages",
+        json=_payload(messages=[{"role": "user", "content": "hi"}, {"role": "tool", "content": "x"}]),
+    )
+
+    assert response.status_code == 400
+    data = response.json()
+    assert data["type"] == "error"
+    assert data["error"]["type"] == "invalid_request_error"
+    assert data["error"]["message"].startswith("messages.1.role: ")
+
+
+@pytest.mark.parametrize("overrides", [
+    {"model": "  "},
+    {"max_tokens": 0},
+    {"messages": []},
+])
+@patch("anthropic_api._get_chat_model")
+def test_invalid_required_fields_are_rejected(mock_get_model, app_client, mock_chat_model, overrides):
+    mock_get_model.return_value = mock_chat_model
+
+    response = app_client.post("/v1/messages", json=_payload(**overrides))
+
+    assert response.status_code == 400
+    data = response.json()
+    assert data["type"] == "error"
+    assert data["error"]["type"] == "invalid_request_error"
+    assert data["error"]["message"].startswith(f"{next(iter(overrides))}: ")
+    assert not mock_get_model.called
+
+
+def test_validation_errors_elsewhere_keep_fastapi_422(app_client):
+    response = app_client.post("/v1/chat/completions", json={"messages": [{"role": "robot"}]})
+
+    assert response.status_code == 422
+    assert "detail" in response.json()
+
+
+@patch("anthropic_api._get_chat_model")
+def test_streaming_accepts_bare_message_chunks(mock_get_model, client, mock_chat_model):
+    async def message_astream(*args, **kwargs):
+        for text in ["Hel", "lo"]:
+            yield AIMessageChunk(content=text)
+
+    mock_chat_model.astream = message_astream
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/messages", json=_payload(stream=True))
+
+    events = _parse_sse(response.text)
+    text = "".join(
+        data["delta"]["text"] for name, data in events if name == "content_block_delta"
+    )
+    assert text == "Hello"
+    assert events[-2][1]["delta"]["stop_reason"] == "end_turn"
+
+
+@patch("anthropic_api._get_chat_model")
+def test_streaming_block_indices_are_sequential(mock_get_model, client, mock_chat_model):
+    async def interleaved_astream(*args, **kwargs):
+        yield AIMessageChunk(content="First")
+        # Tool index 1 with no index 0, followed by more text
+        yield AIMessageChunk(content="", additional_kwargs={"tool_calls": [
+            {"index": 1, "id": "call_x", "type": "function",
+             "function": {"name": "lookup", "arguments": "{}"}},
+        ]})
+        yield AIMessageChunk(content="Then")
+
+    mock_chat_model.astream = interleaved_astream
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/messages", json=_payload(stream=True))
+
+    events = _parse_sse(response.text)
+    starts = [(data["index"], data["content_block"]["type"])
+              for name, data in events if name == "content_block_start"]
+    assert starts == [(0, "text"), (1, "tool_use"), (2, "text")]
+    stops = sorted(data["index"] for name, data in events if name == "content_block_stop")
+    assert stops == [0, 1, 2]
+
+
+@patch("api.OCAChatModel.from_env")
+@patch("api.OCAOauth2TokenManager")
+def test_chat_model_follows_the_current_lifespan(mock_token_manager, mock_from_env):
+    """The real getter must not keep serving a chat model closed by an earlier shutdown."""
+    first, second = MagicMock(), MagicMock()
+    first.token_manager.aclose = AsyncMock()
+    second.token_manager.aclose = AsyncMock()
+    mock_from_env.side_effect = [first, second]
+
+    seen = []
+    for _ in range(2):
+        with TestClient(api.app):
+            seen.append(anthropic_api._get_chat_model())
+
+    assert seen[0] is first
+    assert seen[1] is second
+    first.token_manager.aclose.assert_awaited_once()
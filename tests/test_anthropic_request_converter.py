@@ -0,0 +1,130 @@
+"""
+Tests for Anthropic Request Converter Functions
+
+This module tests converters/anthropic_request_converter.py, ensuring
+Anthropic content blocks map to the expected LangChain messages.
+"""
+
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from converters.anthropic_request_converter import (
+    anthropic_to_langchain_messages,
+    create_anthropic_error_response,
+    langchain_to_anthropic_response,
+)
+from models.anthropic_types import AnthropicMessage, AnthropicResponse
+
+
+def test_user_blocks_emit_text_before_tool_results():
+    """Text/image blocks become one HumanMessage ahead of the ToolMessages."""
+    msg = AnthropicMessage(role="user", content=[
+        {"type": "tool_result", "tool_use_id": "toolu_1", "content": "42"},
+        {"type": "text", "text": "Here you go"},
+        {"type": "tool_result", "tool_use_id": "toolu_2",
+         "content": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]},
+        {"type": "image"},
+    ])
+
+    result = anthropic_to_langchain_messages([msg])
+
+    assert [type(m) for m in result] == [HumanMessage, ToolMessage, ToolMessage]
+    assert result[0].content == "Here you go\n[Image]"
+    assert (result[1].tool_call_id, result[1].content) == ("toolu_1", "42")
+    assert (result[2].tool_call_id, result[2].content) == ("toolu_2", "a\nb")
+
+
+def test_assistant_blocks_collect_text_and_tool_calls():
+    msg = AnthropicMessage(role="assistant", content=[
+        {"type": "text", "text": "Let me check"},
+        {"type": "tool_use", "id": "toolu_1", "name": "lookup", "input": {"q": "x"}},
+        {"type": "text", "text": "and this"},
+    ])
+
+    [ai] = anthropic_to_langchain_messages([msg])
+
+    assert isinstance(ai, AIMessage)
+    assert ai.content == "Let me check\nand this"
+    [call] = ai.additional_kwargs["tool_calls"]
+    assert call["id"] == "toolu_1"
+    assert call["function"]["name"] == "lookup"
+    assert json.loads(call["function"]["arguments"]) == {"q": "x"}
+
+
+def test_assistant_text_only_has_no_tool_calls():
+    msg = AnthropicMessage(role="assistant", content=[{"type": "text", "text": "Hi"}])
+
+    [ai] = anthropic_to_langchain_messages([msg])
+
+    assert ai == AIMessage(content="Hi")
+    assert "tool_calls" not in ai.additional_kwargs
+
+
+def test_response_serializes_like_validated_models():
+    """model_construct-built responses dump the same JSON as validated ones."""
+    ai = AIMessage(content="Checking", additional_kwargs={"tool_calls": [
+        {"type": "function", "id": "call_1",
+         "function": {"name": "weather", "arguments": '{"city": "Tokyo"}'}},
+        {"type": "function", "id": "call_2",
+         "function": {"name": "noop", "arguments": "not json"}},
+    ]})
+
+    resp = langchain_to_anthropic_response(ai, model="oca/gpt-4.1", input_tokens=3, output_tokens=5)
+
+    data = json.loads(resp.model_dump_json(exclude_none=True))
+    assert data == json.loads(
+        AnthropicResponse.model_validate(data).model_dump_json(exclude_none=True)
+    )
+    assert data["id"].startswith("msg_")
+    assert (data["type"], data["role"], data["stop_reason"]) == ("message", "assistant", "tool_use")
+    assert data["content"] == [
+        {"type": "text", "text": "Checking"},
+        {"type": "tool_use", "id": "call_1", "name": "weather", "input": {"city": "Tokyo"}},
+        {"type": "tool_use", "id": "call_2", "name": "noop", "input": {}},
+    ]
+    assert data["usage"] == {"input_tokens": 3, "output_tokens": 5}
+
+
+def test_string_only_messages_match_validated_messages():
+    messages = [
+        AnthropicMessage(role="system", content="s"),
+        AnthropicMessage(role="user", content="u"),
+        AnthropicMessage(role="assistant", content="a"),
+    ]
+
+    lc_messages = anthropic_to_langchain_messages(messages)
+
+    assert lc_messages == [SystemMessage(content="s"), HumanMessage(content="u"), AIMessage(content="a")]
+    assert lc_messages[2].tool_calls == []
+
+
+def test_assistant_tool_use_is_parsed_into_tool_calls():
+    msg = AnthropicMessage(role="assistant", content=[
+        {"type": "tool_use", "id": "toolu_1", "name": "lookup", "input": {"q": "x"}},
+    ])
+
+    [ai] = anthropic_to_langchain_messages([msg])
+
+    assert ai.tool_calls == [{"name": "lookup", "args": {"q": "x"}, "id": "toolu_1", "type": "tool_call"}]
+
+
+def test_error_response_dumps_anthropic_error_shape():
+    error = create_anthropic_error_response("rate_limit_error", "slow down")
+
+    assert error.model_dump() == {
+        "type": "error",
+        "error": {"type": "rate_limit_error", "message": "slow down"},
+    }
+
+
+def test_response_uses_parsed_tool_calls():
+    """LangChain-format tool_calls (no OpenAI additional_kwargs) are converted too."""
+    ai = AIMessage(content="", tool_calls=[{"name": "lookup", "args": {"q": "x"}, "id": "call_1"}])
+
+    resp = langchain_to_anthropic_response(ai, model="oca/gpt-4.1")
+
+    assert resp.stop_reason == "tool_use"
+    assert [(b.type, b.id, b.name, b.input) for b in resp.content] == [
+        ("tool_use", "call_1", "lookup", {"q": "x"}),
+    ]
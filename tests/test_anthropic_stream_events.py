@@ -0,0 +1,99 @@
+"""
+Tests for the Anthropic SSE event helpers in anthropic_api.
+
+The helpers build event payloads as plain dicts for speed; these tests pin the
+wire format to what the AnthropicStream* pydantic models would serialize.
+"""
+
+import json
+
+from anthropic_api import (
+    generate_message_start,
+    generate_content_block_start,
+    generate_content_block_delta,
+    generate_content_block_stop,
+    generate_message_delta,
+    generate_message_stop,
+)
+from models.anthropic_types import (
+    AnthropicResponse,
+    AnthropicUsage,
+    AnthropicStreamMessageStart,
+    AnthropicStreamContentBlockStart,
+    AnthropicStreamContentBlockDelta,
+    AnthropicStreamContentBlockStop,
+    AnthropicStreamMessageDelta,
+    AnthropicStreamMessageStop,
+)
+
+
+def _parse(frame: bytes) -> tuple[str, dict]:
+    assert isinstance(frame, bytes)
+    assert frame.endswith(b"\n\n")
+    event_line, data_line = frame.decode("utf-8").rstrip("\n").split("\n")
+    assert event_line.startswith("event: ")
+    assert data_line.startswith("data: ")
+    return event_line[len("event: "):], json.loads(data_line[len("data: "):])
+
+
+def _model_json(model) -> dict:
+    return json.loads(model.model_dump_json(exclude_none=True))
+
+
+def test_message_start_matches_model():
+    event, data = _parse(generate_message_start("msg_abc", "oca/gpt-4.1"))
+    expected = AnthropicStreamMessageStart(
+        message=AnthropicResponse(
+            id="msg_abc",
+            model="oca/gpt-4.1",
+            content=[],
+            usage=AnthropicUsage(input_tokens=0, output_tokens=0),
+        )
+    )
+    assert event == "message_start"
+    assert data == _model_json(expected)
+
+
+def test_content_block_start_text_and_tool_use():
+    for index, block in (
+        (0, {"type": "text", "text": ""}),
+        (1, {"type": "tool_use", "id": "toolu_1", "name": "get_weather", "input": {}}),
+    ):
+        event, data = _parse(generate_content_block_start(index, block))
+        expected = AnthropicStreamContentBlockStart(index=index, content_block=block)
+        assert event == "content_block_start"
+        assert data == _model_json(expected)
+
+
+def test_content_block_delta_text_and_json():
+    event, data = _parse(generate_content_block_delta(0, "text_delta", text="héllo\n"))
+    assert event == "content_block_delta"
+    assert data == _model_json(
+        AnthropicStreamContentBlockDelta(index=0, delta={"type": "text_delta", "text": "héllo\n"})
+    )
+
+    event, data = _parse(generate_content_block_delta(2, "input_json_delta", partial_json='{"city": "To'))
+    assert data == _model_json(
+        AnthropicStreamContentBlockDelta(
+            index=2, delta={"type": "input_json_delta", "partial_json": '{"city": "To'}
+        )
+    )
+
+
+def test_stop_and_delta_events():
+    event, data = _parse(generate_content_block_stop(3))
+    assert event == "content_block_stop"
+    assert data == _model_json(AnthropicStreamContentBlockStop(index=3))
+
+    usage = AnthropicUsage(input_tokens=0, output_tokens=7)
+    event, data = _parse(generate_message_delta("tool_use", usage))
+    assert event == "message_delta"
+    assert data == _model_json(
+        AnthropicStreamMessageDelta(
+            delta={"stop_reason": "tool_use", "stop_sequence": None}, usage=usage
+        )
+    )
+
+    event, data = _parse(generate_message_stop())
+    assert event == "message_stop"
+    assert data == _model_json(AnthropicStreamMessageStop())
@@ -0,0 +1,335 @@
+"""
+Integration Tests for the OpenAI-compatible /v1/chat/completions endpoint
+
+Exercises the route with a mocked chat model, covering both the
+non-streaming JSON body and the streaming SSE chunk sequence.
+"""
+
+import json
+import time
+from unittest.mock import patch, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
+
+import api
+
+
+@pytest.fixture
+def client():
+    """Create a test client without running the app lifespan."""
+    return TestClient(api.app)
+
+
+@pytest.fixture
+def mock_chat_model():
+    """Create a mock chat model that streams two text chunks."""
+    mock = MagicMock()
+    mock.model = "oca/gpt-4.1"
+    mock.model_api_support = {"oca/gpt-4.1": ["CHAT_COMPLETIONS"]}
+    mock.invoke = MagicMock(return_value=AIMessage(content="Hello!"))
+
+    async def mock_ainvoke(*args, **kwargs):
+        return mock.invoke(*args, **kwargs)
+
+    mock.ainvoke = mock_ainvoke
+
+    mock.astream_kwargs = []
+
+    async def mock_astream(*args, **kwargs):
+        mock.astream_kwargs.append(kwargs)
+        for text in ["Hel", "lo!"]:
+            yield AIMessageChunk(content=text)
+
+    mock.astream = mock_astream
+    return mock
+
+
+def _payload(**overrides):
+    payload = {
+        "model": "oca/gpt-4.1",
+        "messages": [{"role": "user", "content": "Hi"}],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _parse_sse(text: str) -> list:
+    frames = [frame[len("data: "):] for frame in text.strip().split("\n\n")]
+    assert frames[-1] == "[DONE]"
+    return [json.loads(frame) for frame in frames[:-1]]
+
+
+@pytest.fixture(autouse=True)
+def _resolve_model_as_is():
+    with patch("api.resolve_model_for_endpoint", side_effect=lambda model, *args: model):
+        yield
+
+
+@patch("api.get_chat_model")
+def test_non_streaming_returns_completion(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/chat/completions", json=_payload())
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["object"] == "chat.completion"
+    assert data["id"].startswith("chatcmpl-")
+    assert len(data["id"]) == len("chatcmpl-") + 29
+    assert data["model"] == "oca/gpt-4.1"
+    assert data["choices"][0]["message"]["role"] == "assistant"
+    assert data["choices"][0]["message"]["content"] == "Hello!"
+    assert data["choices"][0]["finish_reason"] == "stop"
+    assert api.ChatCompletionResponse.model_validate(data).model_dump() == data
+
+
+@patch("api.get_chat_model")
+def test_streaming_chunks_share_id_and_created(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/chat/completions", json=_payload(stream=True))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-accel-buffering"] == "no"
+    chunks = _parse_sse(response.text)
+    # Back-to-back text chunks are coalesced into one frame
+    assert [c["choices"][0]["delta"] for c in chunks] == [{"content": "Hello!"}, {}]
+    assert {c["id"] for c in chunks} == {chunks[0]["id"]}
+    assert {c["created"] for c in chunks} == {chunks[0]["created"]}
+    assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+@patch("api.get_chat_model")
+def test_request_params_are_passed_per_call(mock_get_model, client, mock_chat_model):
+    mock_get_model.return_value = mock_chat_model
+    payload = _payload(model="oca/other", temperature=0.2)
+
+    client.post("/v1/chat/completions", json=payload)
+    client.post("/v1/chat/completions", json={**payload, "stream": True})
+
+    invoke_kwargs = mock_chat_model.invoke.call_args.kwargs
+    for kwargs in (invoke_kwargs, mock_chat_model.astream_kwargs[0]):
+        assert (kwargs["model"], kwargs["temperature"]) == ("oca/other", 0.2)
+    # The shared model instance is never reconfigured per request
+    assert mock_chat_model.model == "oca/gpt-4.1"
+    assert not isinstance(mock_chat_model.temperature, float)
+
+
+def test_convert_to_langchain_messages_maps_roles_and_content():
+    messages = [
+        api.ChatMessage(role="system", content="Be brief."),
+        api.ChatMessage(role="user", content=[
+            {"type": "text", "text": "a"}, {"type": "image_url"}, {"type": "text", "text": "b"},
+        ]),
+        api.ChatMessage(role="assistant", content=None, tool_calls=[{"id": "call_1", "type": "function"}]),
+        api.ChatMessage(role="tool", content="42", tool_call_id="call_1"),
+        api.ChatMessage(role="developer", content="ignored"),
+    ]
+
+    lc_messages = api.convert_to_langchain_messages(messages)
+
+    assert [m.type for m in lc_messages] == ["system", "human", "ai", "tool"]
+    assert lc_messages[1].content == "a\nb"
+    assert lc_messages[2].content == ""
+    assert lc_messages[2].additional_kwargs == {"tool_calls": [{"id": "call_1", "type": "function"}]}
+    assert lc_messages[3].tool_call_id == "call_1"
+
+
+def test_convert_to_langchain_messages_matches_validated_messages():
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "f", "arguments": "{}"}}
+    messages = [
+        api.ChatMessage(role="system", content="s"),
+        api.ChatMessage(role="user", content="u"),
+        api.ChatMessage(role="assistant", content="a"),
+        api.ChatMessage(role="assistant", content="", tool_calls=[tool_call]),
+        api.ChatMessage(role="tool", content="42", tool_call_id="call_1"),
+    ]
+
+    lc_messages = api.convert_to_langchain_messages(messages)
+
+    assert lc_messages == [
+        SystemMessage(content="s"),
+        HumanMessage(content="u"),
+        AIMessage(content="a"),
+        AIMessage(content="", additional_kwargs={"tool_calls": [tool_call]}),
+        ToolMessage(content="42", tool_call_id="call_1"),
+    ]
+    assert lc_messages[3].tool_calls[0]["name"] == "f"
+
+
+def test_invalid_request_returns_422(client):
+    response = client.post(
+        "/v1/chat/completions",
+        json={"messages": [{"role": "user"}, {"role": "robot"}], "temperature": "hot"},
+    )
+
+    assert response.status_code == 422
+    locs = [tuple(e["loc"]) for e in response.json()["detail"]]
+    assert ("body", "model") in locs
+    assert ("body", "temperature") in locs
+    assert ("body", "messages", 1, "role") in locs
+
+
+def test_malformed_json_returns_422(client):
+    response = client.post(
+        "/v1/chat/completions", content=b'{"model": ', headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+def test_chat_completions_request_schema_is_documented(client):
+    operation = client.get("/openapi.json").json()["paths"]["/v1/chat/completions"]["post"]
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+
+    assert schema["required"] == ["model", "messages"]
+    assert "tool_call_id" in schema["properties"]["messages"]["items"]["properties"]
+
+
+def test_chat_completions_response_schema_is_documented(client):
+    openapi = client.get("/openapi.json").json()
+    content = openapi["paths"]["/v1/chat/completions"]["post"]["responses"]["200"]["content"]
+
+    assert content["application/json"]["schema"] == {"$ref": "#/components/schemas/ChatCompletionResponse"}
+    assert "ChatCompletionChoice" in openapi["components"]["schemas"]
+    stream_schema = content["text/event-stream"]["schema"]
+    assert stream_schema["properties"]["object"]["const"] == "chat.completion.chunk"
+    assert "delta" in stream_schema["properties"]["choices"]["items"]["properties"]
+
+
+def test_responses_endpoint_rejects_malformed_json(client):
+    response = client.post(
+        "/v1/responses", content=b'{"model": ', headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"]["message"] == "Invalid JSON in request body"
+
+
+def test_validation_handler_dumps_request_body(monkeypatch):
+    written = {}
+    monkeypatch.setattr(api, "_write_debug_file", lambda path, data: written.update(path=path, data=data))
+    client = TestClient(api.app)
+
+    response = client.post("/v1/chat/completions", content=b'{"messages": "nope"}',
+                           headers={"content-type": "application/json"})
+
+    assert response.status_code == 422
+    # The dump is written by a background task; give it a moment to land
+    deadline = time.monotonic() + 2
+    while "data" not in written and time.monotonic() < deadline:
+        time.sleep(0.01)
+    dump = json.loads(written["data"])
+    assert written["path"] == "logs/validation_error_request.json"
+    assert dump["method"] == "POST"
+    assert dump["body"] == {"messages": "nope"}
+    assert dump["errors"]
+
+
+@patch("api.get_chat_model")
+def test_streaming_forwards_tool_call_deltas(mock_get_model, client, mock_chat_model):
+    tool_call = {"index": 0, "id": "call_1", "type": "function",
+                 "function": {"name": "get_weather", "arguments": "{}"}}
+
+    async def tool_astream(*args, **kwargs):
+        yield AIMessageChunk(content="", additional_kwargs={"tool_calls": [tool_call]})
+
+    mock_chat_model.astream = tool_astream
+    mock_get_model.return_value = mock_chat_model
+
+    response = client.post("/v1/chat/completions", json=_payload(stream=True))
+
+    chunks = _parse_sse(response.text)
+    assert chunks[0]["choices"][0]["delta"] == {"tool_calls": [tool_call]}
+
+
+@patch("api.get_chat_model")
+def test_model_endpoints_match_their_schemas(mock_get_model, client, mock_chat_model):
+    mock_chat_model.available_models = ["oca/gpt-4.1", "oca/gpt-5.4"]
+    mock_get_model.return_value = mock_chat_model
+
+    models = client.get("/v1/models").json()
+    assert api.ModelList.model_validate(models).model_dump() == models
+    assert [m["id"] for m in models["data"]] == ["oca/gpt-4.1", "oca/gpt-5.4"]
+
+    info = client.get("/v1/model/info").json()
+    expected = api.ModelInfoList(data=[
+        api.ModelData(
+            model_name=model_id,
+            litellm_params=api.LiteLLMParams(model=model_id),
+            model_info=api.ModelInfo(id=model_id, key=model_id, mode="chat", litellm_provider="oca"),
+        )
+        for model_id in mock_chat_model.available_models
+    ])
+    assert info == expected.model_dump()
+
+
+def test_model_list_body_is_cached_until_models_change():
+    models = ["oca/gpt-4.1"]
+    first = api._model_list_body(models)
+
+    assert api._model_list_body(models) is first
+
+    replaced = ["oca/gpt-4.1", "oca/gpt-5.4"]
+    assert [m["id"] for m in json.loads(api._model_list_body(replaced))["data"]] == replaced
+
+
+def test_model_info_body_is_cached_until_models_change():
+    models = ["oca/gpt-4.1"]
+    first, first_etag = api._model_info_body(models)
+
+    assert api._model_info_body(models)[0] is first
+
+    replaced = ["oca/gpt-4.1", "oca/gpt-5.4"]
+    body, etag = api._model_info_body(replaced)
+    assert [entry["model_name"] for entry in json.loads(body)["data"]] == replaced
+    assert etag != first_etag
+
+
+@patch("api.get_chat_model")
+def test_json_bodies_are_gzipped_but_streams_are_not(mock_get_model, client, mock_chat_model):
+    mock_chat_model.available_models = [f"oca/model-{i}" for i in range(50)]
+    mock_get_model.return_value = mock_chat_model
+
+    info = client.get("/v1/model/info", headers={"Accept-Encoding": "gzip"})
+    stream = client.post("/v1/chat/completions", json=_payload(stream=True), headers={"Accept-Encoding": "gzip"})
+
+    assert info.headers["content-encoding"] == "gzip"
+    assert len(info.json()["data"]) == 50
+    assert "content-encoding" not in stream.headers
+
+
+@patch("api.get_chat_model")
+def test_model_info_honours_if_none_match(mock_get_model, client, mock_chat_model):
+    mock_chat_model.available_models = ["oca/gpt-4.1"]
+    mock_get_model.return_value = mock_chat_model
+
+    etag = client.get("/v1/model/info").headers["etag"]
+    response = client.get("/v1/model/info", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert client.get("/v1/model/info", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+@pytest.mark.parametrize("header", [
+    "W/{etag}",
+    '"other", {etag}',
+    '"other",W/{etag}',
+    "*",
+])
+@patch("api.get_chat_model")
+def test_model_info_if_none_match_uses_weak_list_comparison(mock_get_model, client, mock_chat_model, header):
+    mock_chat_model.available_models = ["oca/gpt-4.1"]
+    mock_get_model.return_value = mock_chat_model
+
+    etag = client.get("/v1/model/info").headers["etag"]
+    response = client.get("/v1/model/info", headers={"If-None-Match": header.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
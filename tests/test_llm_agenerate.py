@@ -0,0 +1,82 @@
+"""Tests for OCAChatModel's native async generation (ainvoke without a worker thread)."""
+import asyncio
+import json
+from unittest.mock import MagicMock, create_autospec
+
+from langchain_core.messages import HumanMessage
+
+from core.oauth2_token_manager import OCAOauth2TokenManager
+
+
+def _sse(delta: dict) -> str:
+    return "data: " + json.dumps({"choices": [{"delta": delta}]})
+
+
+STREAM_LINES = [
+    _sse({"content": "Check"}),
+    _sse({"content": "ing"}),
+    _sse({"tool_calls": [{"index": 0, "id": "call_1", "type": "function",
+                          "function": {"name": "get_weather", "arguments": ""}}]}),
+    _sse({"tool_calls": [{"index": 0, "function": {"arguments": '{"city": '}}]}),
+    _sse({"tool_calls": [{"index": 0, "function": {"arguments": '"Tokyo"}'}}]}),
+    "data: [DONE]",
+]
+
+
+def _make_model(stream_lines=STREAM_LINES):
+    tm = create_autospec(OCAOauth2TokenManager, instance=True)
+    tm.get_access_token.return_value = "fake-token"
+    catalog = MagicMock()
+    catalog.json.return_value = {"data": [{"litellm_params": {"model": "oca/gpt-4.1"}, "model_info": {}}]}
+    catalog.raise_for_status.return_value = None
+    tm.request.return_value = catalog
+
+    async def fake_stream(**kwargs):
+        tm.stream_payloads.append(kwargs["json"])
+        for line in stream_lines:
+            yield line
+
+    tm.stream_payloads = []
+    tm.async_stream_request = fake_stream
+
+    from core.llm import OCAChatModel
+    return OCAChatModel(
+        api_url="http://fake",
+        model="oca/gpt-4.1",
+        temperature=0.7,
+        token_manager=tm,
+        models_api_url="http://fake/models",
+    )
+
+
+def test_ainvoke_aggregates_content_and_tool_calls(monkeypatch):
+    model = _make_model()
+    monkeypatch.setattr(model.__class__, "_generate", MagicMock(side_effect=AssertionError("sync path used")))
+
+    message = asyncio.run(model.ainvoke("Weather in Tokyo?", model="oca/other", temperature=0.1))
+
+    assert message.content == "Checking"
+    assert message.additional_kwargs["tool_calls"] == [{
+        "type": "function",
+        "id": "call_1",
+        "function": {"name": "get_weather", "arguments": '{"city": "Tokyo"}'},
+    }]
+    payload = model.token_manager.stream_payloads[0]
+    assert (payload["model"], payload["temperature"]) == ("oca/other", 0.1)
+    assert (model.model, model.temperature) == ("oca/gpt-4.1", 0.7)
+
+
+def test_astream_drops_empty_deltas():
+    model = _make_model([
+        _sse({"role": "assistant", "content": ""}),
+        _sse({"content": "", "tool_calls": []}),
+        _sse({"content": "Hi"}),
+        _sse({}),
+        "data: [DONE]",
+    ])
+
+    async def collect():
+        # _astream directly: astream() itself appends a final empty marker chunk
+        return [chunk.message.content async for chunk in model._astream([HumanMessage(content="Hello")])]
+
+    assert asyncio.run(collect()) == ["Hi"]
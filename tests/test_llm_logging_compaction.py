@@ -1,5 +1,6 @@
 import logging
 from io import StringIO
+from logging.handlers import QueueHandler
 from unittest.mock import Mock
 
 import core.llm as llm
@@ -121,3 +122,22 @@ def test_log_llm_request_detail_marks_record_as_file_only(monkeypatch):
     assert "<redacted>" in args[1]
     assert '"model": "oca/gpt-5.2"' in args[2]
     assert kwargs["extra"] == {"console": False}
+
+
+def test_logger_writes_file_from_background_listener(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    monkeypatch.setenv("LOG_FILE_PATH", str(tmp_path / "bg.log"))
+
+    logger = get_logger("tests.background_file")
+    (queue_handler,) = logger.handlers
+    assert isinstance(queue_handler, QueueHandler)
+
+    logger.info("queued message")
+    queue_handler.flush()
+    assert "queued message" in (tmp_path / "bg.log").read_text(encoding="utf-8")
+
+    # Reconfiguring closes the previous handler and stops its listener thread
+    listener = queue_handler.listener
+    get_logger("tests.background_file")
+    assert queue_handler.listener is None
+    assert listener._thread is None
@@ -341,3 +341,27 @@ def test_from_env_model_already_prefixed_unchanged(monkeypatch):
     from core.llm import OCAChatModel
     model = OCAChatModel.from_env(tm)
     assert model.model == "oca/gpt-4.1"
+
+
+def test_available_models_set_tracks_list_replacement():
+    tm = _make_token_manager()
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = CATALOG_RESPONSE
+    mock_resp.raise_for_status.return_value = None
+    tm.request.return_value = mock_resp
+
+    from core.llm import OCAChatModel
+    model = OCAChatModel(
+        api_url="http://fake",
+        model="oca/gpt-5.4",
+        temperature=0.7,
+        token_manager=tm,
+        models_api_url="http://fake/models",
+    )
+
+    first = model.available_models_set
+    assert first == frozenset(model.available_models)
+    assert model.available_models_set is first
+
+    model.available_models = ["oca/gpt-5.4"]
+    assert model.available_models_set == frozenset({"oca/gpt-5.4"})
@@ -81,8 +81,8 @@ def mock_chat_model():
     # resolve_model_for_endpoint treats empty dict as "catalog unavailable" (fail-open).
     mock.model_api_support = {}
 
-    # Mock invoke to return a simple AIMessage
-    mock.invoke = MagicMock(return_value=AIMessage(content="Hello! How can I help you today?"))
+    # Mock ainvoke to return a simple AIMessage
+    mock.ainvoke = AsyncMock(return_value=AIMessage(content="Hello! How can I help you today?"))
 
     # Mock astream as async generator
     async def mock_astream(*args, **kwargs):
@@ -281,6 +281,7 @@ class TestStreamingResponse:
 
         assert response.status_code == 200
         assert "text/event-stream" in response.headers.get("content-type", "")
+        assert response.headers["x-accel-buffering"] == "no"
 
         # Parse SSE events
         content = response.text
@@ -419,7 +420,7 @@ class TestToolCallsInResponse:
         mock_model.available_models = ["oca/gpt-4o"]
         mock_model.model = "oca/gpt-4o"
         mock_model.model_api_support = {}
-        mock_model.invoke = MagicMock(return_value=AIMessage(
+        mock_model.ainvoke = AsyncMock(return_value=AIMessage(
             content="Let me check that.",
             additional_kwargs={
                 "tool_calls": [{
@@ -539,7 +540,7 @@ class TestEdgeCases:
         mock_model = MagicMock()
         mock_model.available_models = ["oca/gpt-4o"]
         mock_model.model_api_support = {}
-        mock_model.invoke = MagicMock(side_effect=Exception("API Error"))
+        mock_model.ainvoke = AsyncMock(side_effect=Exception("API Error"))
         mock_get_model.return_value = mock_model
 
         response = client.post(
@@ -536,9 +536,11 @@ class TestStreamEventHelpers:
             delta="Hello"
         )
         formatted = format_stream_event(event)
-        assert formatted.startswith("event: response.output_text.delta\n")
-        assert "data:" in formatted
-        assert formatted.endswith("\n\n")
+        assert formatted.startswith(b"event: response.output_text.delta\n")
+        assert b"data:" in formatted
+        assert formatted.endswith(b"\n\n")
+        data_line = formatted.split(b"\n")[1]
+        assert json.loads(data_line[len(b"data: "):]) == event
 
 
 class TestEdgeCases:
@@ -260,3 +260,39 @@ def test_async_stream_request_preserves_unicode_separator_inside_json(monkeypatc
         f'data: {{"choices":[{{"delta":{{"content":"{LINE_SEPARATOR}foo"}}}}]}}',
         "",
     ]
+
+
+def test_async_stream_request_reuses_pooled_client(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("OAUTH_HOST=example.test\nOAUTH_CLIENT_ID=test-client\n", encoding="utf-8")
+    manager = OCAOauth2TokenManager(str(env_file))
+
+    created = []
+    closed = []
+
+    class CountingAsyncClient:
+        def __init__(self, *args, **kwargs):
+            created.append(kwargs)
+
+        def stream(self, *args, **kwargs):
+            return FakeStreamingResponse([b"data: ok\n\n"])
+
+        async def aclose(self):
+            closed.append(self)
+
+    monkeypatch.delenv("FORCE_PROXY", raising=False)
+    monkeypatch.setattr("core.oauth2_token_manager.httpx.AsyncClient", CountingAsyncClient)
+
+    async def two_requests_then_close():
+        for _ in range(2):
+            await collect_lines(
+                manager.async_stream_request(
+                    method="POST", url="https://example.test/v1/chat/completions", _do_retry=False, json={}
+                )
+            )
+        await manager.aclose()
+
+    asyncio.run(two_requests_then_close())
+
+    assert len(created) == 1
+    assert len(closed) == 1
@@ -0,0 +1,56 @@
+"""
+Tests for core.stream_coalescing.coalesce_text_deltas.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from core.stream_coalescing import coalesce_text_deltas
+
+
+def _collect_deltas(chunks):
+    async def collect():
+        return [delta async for delta in coalesce_text_deltas(chunks)]
+    return asyncio.run(collect())
+
+
+def test_coalesce_text_deltas_merges_fast_text_chunks():
+    async def fast():
+        for ch in "hello world":
+            yield AIMessageChunk(content=ch)
+
+    assert _collect_deltas(fast()) == [("hello world", {})]
+
+
+def test_coalesce_text_deltas_flushes_at_size_and_when_idle():
+    async def stream():
+        yield AIMessageChunk(content="x" * 70)
+        yield AIMessageChunk(content="a")
+        await asyncio.sleep(0.05)
+        yield AIMessageChunk(content="b")
+
+    assert [text for text, _ in _collect_deltas(stream())] == ["x" * 70, "a", "b"]
+
+
+def test_coalesce_text_deltas_prepends_pending_text_to_tool_call_chunk():
+    tool_calls = [{"index": 0, "id": "call_1", "function": {"name": "f", "arguments": ""}}]
+
+    async def stream():
+        yield AIMessageChunk(content="Let me ")
+        yield AIMessageChunk(content="check", additional_kwargs={"tool_calls": tool_calls})
+        yield AIMessageChunk(content="", additional_kwargs={"tool_calls": tool_calls})
+
+    assert _collect_deltas(stream()) == [
+        ("Let me check", {"tool_calls": tool_calls}),
+        ("", {"tool_calls": tool_calls}),
+    ]
+
+
+def test_coalesce_text_deltas_unwraps_generation_chunks():
+    async def stream():
+        yield ChatGenerationChunk(message=AIMessageChunk(content="a"))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="b"))
+
+    assert _collect_deltas(stream()) == [("ab", {})]
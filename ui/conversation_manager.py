@@ -65,7 +65,8 @@ def delete_chat(key: str):
         del st.session_state.conversations[key]
         if is_current:
             new_chat()
-        st.rerun()
+        # Used as an on_click callback: Streamlit reruns on its own afterwards
+        # (st.rerun() inside a callback is a no-op)
 
 def generate_title(chat_model: OCAChatModel, messages: list) -> str:
     """Use LLM to generate a concise English title for the conversation."""